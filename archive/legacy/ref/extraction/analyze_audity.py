@@ -2,10 +2,48 @@
 """
 Quick analysis of Audity 2000 file structure
 """
+import mmap
+import re
 import struct
 import sys
 import os
 
+# Common EMU signatures
+SIGNATURES = [
+    b'FORM', b'CWAV', b'RIFF', b'EMU', b'EMU2',
+    b'BANK', b'PRES', b'SAMP', b'TOC2', b'E5P1'
+]
+
+# Runs of 4+ printable ASCII bytes
+PRINTABLE_RUN = re.compile(rb'[\x20-\x7e]{4,}')
+
+# Hexdump ASCII column: printable bytes pass through, the rest become '.'
+ASCII_TABLE = bytes(i if 32 <= i < 127 else ord('.') for i in range(256))
+
+# All signatures as one alternation, longest first; the lookahead keeps
+# matches zero-width so overlapping hits are still found in one pass
+SIG_RE = re.compile(b'(?=(' + b'|'.join(
+    re.escape(sig) for sig in sorted(SIGNATURES, key=len, reverse=True)) + b'))')
+
+# A hit on a signature is also a hit on any signature that prefixes it
+SIG_PREFIXES = {sig: [s for s in SIGNATURES if sig.startswith(s)]
+                for sig in SIGNATURES}
+
+def find_signatures(header):
+    """Return (offset, signature) for the first hit of each signature"""
+    hits = {}
+    for m in SIG_RE.finditer(header):
+        for sig in SIG_PREFIXES[m.group(1)]:
+            hits.setdefault(sig, m.start())
+        if len(hits) == len(SIGNATURES):
+            break
+    return sorted((pos, sig) for sig, pos in hits.items())
+
+def _iter_strings(chunk):
+    """Yield printable ASCII runs of 4+ bytes"""
+    for m in PRINTABLE_RUN.finditer(chunk):
+        yield m.group().decode('ascii')
+
 def analyze_file(filepath):
     """Analyze the structure of an EMU file"""
     if not os.path.exists(filepath):
@@ -17,52 +55,45 @@ def analyze_file(filepath):
     print(f"Size: {filesize:,} bytes ({filesize/1024/1024:.1f} MB)")
     print()
 
-    with open(filepath, 'rb') as f:
-        # Read first 1024 bytes for header analysis
-        header = f.read(1024)
+    if filesize == 0:
+        print("Empty file, nothing to analyze")
+        return
 
-        print("=== Header Analysis ===")
+    # Map the file once; header and string scans both slice the same pages
+    with open(filepath, 'rb') as f, \
+         mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # First 1024 bytes for header analysis, 4096 for text strings
+        header = mm[:1024]
+        chunk = mm[:4096]
 
-        # Look for common EMU signatures
-        signatures = [
-            b'FORM', b'CWAV', b'RIFF', b'EMU', b'EMU2',
-            b'BANK', b'PRES', b'SAMP', b'TOC2', b'E5P1'
-        ]
+        print("=== Header Analysis ===")
 
-        for sig in signatures:
-            pos = header.find(sig)
-            if pos >= 0:
-                print(f"Found '{sig.decode('ascii', errors='ignore')}' at offset {pos:04X}")
+        # Look for common EMU signatures (single pass over the header)
+        for pos, sig in find_signatures(header):
+            print(f"Found '{sig.decode('ascii', errors='ignore')}' at offset {pos:04X}")
 
         print()
 
         # Show hex dump of first 256 bytes
         print("=== First 256 bytes ===")
         for i in range(0, min(256, len(header)), 16):
-            hex_part = ' '.join(f'{b:02X}' for b in header[i:i+16])
-            ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in header[i:i+16])
+            hex_part = header[i:i+16].hex(' ').upper()
+            ascii_part = header[i:i+16].translate(ASCII_TABLE).decode('ascii')
             print(f"{i:04X}: {hex_part:<48} {ascii_part}")
 
         print()
 
         # Look for text strings (4+ printable chars)
         print("=== Text Strings (first 4096 bytes) ===")
-        f.seek(0)
-        chunk = f.read(4096)
-
-        text = ""
-        strings_found = []
-        for b in chunk:
-            if 32 <= b < 127:  # Printable ASCII
-                text += chr(b)
-            else:
-                if len(text) >= 4:
-                    strings_found.append(text)
-                text = ""
+        # Collect the first 20 unique strings, in order of appearance
+        seen = {}
+        for s in _iter_strings(chunk):
+            seen.setdefault(s, None)
+            if len(seen) >= 20:
+                break
 
         # Show unique strings
-        unique_strings = list(set(strings_found))[:20]  # First 20 unique
-        for s in sorted(unique_strings):
+        for s in sorted(seen):
             print(f"  '{s}'")
 
 if __name__ == "__main__":
@@ -3,18 +3,53 @@
 Accurate DSP Analysis based on ZPlaneStyle.cpp implementation
 """
 
+import functools
 import json
 import numpy as np
 from datetime import datetime
 import sys
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+def _write_report(report, path):
+    """Write a report as indented JSON, via orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+# Report timestamp format; one timestamp is shared by every instance in a run
+_TS_FMT = "%Y%m%d_%H%M%S"
+
+@functools.cache
+def _now_ts():
+    return datetime.now().strftime(_TS_FMT)
+
 class AccurateDSPAnalysis:
     def __init__(self):
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Output lines are buffered and written once per run
+        self._log = []
+        self._p = self._log.append
+        self.timestamp = _now_ts()
+
+    def log(self, line):
+        """Buffer one output line; flush_log writes them out"""
+        self._log.append(line)
+
+    def flush_log(self):
+        """Write buffered output lines to stdout in a single call"""
+        if self._log:
+            sys.stdout.write('\n'.join(self._log) + '\n')
+            self._log.clear()
 
     def analyze_zplane_stability(self):
         """Analyze actual ZPlaneStyle implementation for stability"""
-        print("[DSP] === ACCURATE SOS STABILITY CHECK ===")
+        self._p("[DSP] === ACCURATE SOS STABILITY CHECK ===")
 
         # Key findings from ZPlaneStyle.cpp:
         stability_features = [
@@ -25,40 +60,38 @@ class AccurateDSPAnalysis:
             "✓ Per-section coefficient validation before filter update"
         ]
 
-        print("[DSP] ZPlaneStyle Stability Features:")
+        self._p("[DSP] ZPlaneStyle Stability Features:")
         for feature in stability_features:
-            print(f"[DSP] {feature}")
+            self._p(f"[DSP] {feature}")
 
         # Analysis of pole radius limits (from lines 128-142)
-        print("[DSP]")
-        print("[DSP] Pole Radius Compliance Analysis:")
+        self._p("[DSP]")
+        self._p("[DSP] Pole Radius Compliance Analysis:")
 
-        sample_rates = [44100, 48000, 88200, 96000]
-        for fs in sample_rates:
-            # From code: r = pow(r, fsRef / fsHost) where fsRef = 48000
-            r_base_44k = 0.997  # Research finding max
-            r_scaled = r_base_44k ** (44100.0 / fs)
+        sample_rates = np.array([44100, 48000, 88200, 96000], dtype=np.float64)
 
-            # Soft limiting logic from lines 136-141
-            K = 4e-4  # Soft-limit parameter from code
-            if r_scaled > r_base_44k ** (44100.0 / fs):
-                delta = 1.0 - r_scaled
-                r_limited = 1.0 - (delta / (1.0 + delta / K))
-                r_final = min(r_limited, r_base_44k ** (44100.0 / fs))
-            else:
-                r_final = r_scaled
+        # From code: r = pow(r, fsRef / fsHost) where fsRef = 48000
+        r_base_44k = 0.997  # Research finding max
+        r_scaled = r_base_44k ** (44100.0 / sample_rates)
 
-            print(f"[DSP]   {fs}Hz: r_scaled={r_scaled:.6f}, r_final={r_final:.6f}")
+        # Soft limiting logic from lines 136-141
+        K = 4e-4  # Soft-limit parameter from code
+        delta = 1.0 - r_scaled
+        r_limited = 1.0 - (delta / (1.0 + delta / K))
+        r_final = np.minimum(r_limited, r_scaled)
 
-        print("[DSP] morphEngine_ZPlane: STABLE")
-        print("[DSP]   Reason: Comprehensive stability safeguards implemented")
+        for fs, r_s, r_f in zip(sample_rates, r_scaled, r_final):
+            self._p(f"[DSP]   {int(fs)}Hz: r_scaled={r_s:.6f}, r_final={r_f:.6f}")
+
+        self._p("[DSP] morphEngine_ZPlane: STABLE")
+        self._p("[DSP]   Reason: Comprehensive stability safeguards implemented")
 
         return True
 
     def analyze_morph_continuity(self):
         """Analyze parameter smoothing and crossfading"""
-        print("[DSP]")
-        print("[DSP] === MORPH CONTINUITY ANALYSIS ===")
+        self._p("[DSP]")
+        self._p("[DSP] === MORPH CONTINUITY ANALYSIS ===")
 
         continuity_features = [
             "✓ Smoothstep easing function (line 85-86)",
@@ -70,20 +103,20 @@ class AccurateDSPAnalysis:
         ]
 
         for feature in continuity_features:
-            print(f"[DSP] {feature}")
+            self._p(f"[DSP] {feature}")
 
-        print("[DSP]")
-        print("[DSP] Transition smoothness: PASS")
-        print("[DSP]   Crossfade triggers on morph changes > 0.1")
-        print("[DSP]   Cosine-curved 64-sample transition")
-        print("[DSP]   Parameter smoothing with 0.3ms time constant")
+        self._p("[DSP]")
+        self._p("[DSP] Transition smoothness: PASS")
+        self._p("[DSP]   Crossfade triggers on morph changes > 0.1")
+        self._p("[DSP]   Cosine-curved 64-sample transition")
+        self._p("[DSP]   Parameter smoothing with 0.3ms time constant")
 
         return True
 
     def analyze_denorm_protection(self):
         """Analyze denormalization protection measures"""
-        print("[DSP]")
-        print("[DSP] === DENORM PROTECTION ANALYSIS ===")
+        self._p("[DSP]")
+        self._p("[DSP] === DENORM PROTECTION ANALYSIS ===")
 
         protection_measures = [
             "✓ FTZ/DAZ enabled via juce::ScopedNoDenormals (line 245, MorphFilter line 25)",
@@ -94,19 +127,19 @@ class AccurateDSPAnalysis:
         ]
 
         for measure in protection_measures:
-            print(f"[DSP] {measure}")
+            self._p(f"[DSP] {measure}")
 
         # No critical hotspots with these protections
-        print("[DSP]")
-        print("[DSP] DENORM HOTSPOTS: None detected with current mitigations")
-        print("[DSP] Energy limiting threshold: +24dBFS internal headroom")
+        self._p("[DSP]")
+        self._p("[DSP] DENORM HOTSPOTS: None detected with current mitigations")
+        self._p("[DSP] Energy limiting threshold: +24dBFS internal headroom")
 
         return True
 
     def analyze_numerical_stability(self):
         """Analyze numerical coefficient handling"""
-        print("[DSP]")
-        print("[DSP] === NUMERICAL STABILITY ===")
+        self._p("[DSP]")
+        self._p("[DSP] === NUMERICAL STABILITY ===")
 
         numerical_features = [
             "✓ Cascade ordering by Q factor (low to high, lines 148-150)",
@@ -118,26 +151,26 @@ class AccurateDSPAnalysis:
         ]
 
         for feature in numerical_features:
-            print(f"[DSP] {feature}")
+            self._p(f"[DSP] {feature}")
 
-        print("[DSP]")
-        print("[DSP] All numerical ranges within safe bounds")
-        print("[DSP] Coefficient validation: COMPREHENSIVE")
+        self._p("[DSP]")
+        self._p("[DSP] All numerical ranges within safe bounds")
+        self._p("[DSP] Coefficient validation: COMPREHENSIVE")
 
         return True
 
     def analyze_sample_rate_conversion(self):
         """Verify matched-Z transform implementation"""
-        print("[DSP]")
-        print("[DSP] === SAMPLE RATE CONVERSION ===")
+        self._p("[DSP]")
+        self._p("[DSP] === SAMPLE RATE CONVERSION ===")
 
         # From line 126: r = pow(r, fsRef / fsHost) where fsRef = 48000
         # From line 117: theta = thRef * (48000.0 / fsHost)
 
-        print("[DSP] Matched-Z Transform Implementation:")
-        print("[DSP] ✓ Radius scaling: r = r^(48kHz/fs) - preserves Q in Hz")
-        print("[DSP] ✓ Theta scaling: θ = θ_ref * (48kHz/fs) - preserves frequency")
-        print("[DSP] ✓ Reference frequency: 48kHz (embedded LUT)")
+        self._p("[DSP] Matched-Z Transform Implementation:")
+        self._p("[DSP] ✓ Radius scaling: r = r^(48kHz/fs) - preserves Q in Hz")
+        self._p("[DSP] ✓ Theta scaling: θ = θ_ref * (48kHz/fs) - preserves frequency")
+        self._p("[DSP] ✓ Reference frequency: 48kHz (embedded LUT)")
 
         # Test key sample rates
         test_cases = [
@@ -147,19 +180,21 @@ class AccurateDSPAnalysis:
             (96000, "High-res audio")
         ]
 
-        for fs, desc in test_cases:
-            r_scale = 48000.0 / fs
-            theta_scale = 48000.0 / fs
-            print(f"[DSP]   {fs}Hz ({desc}): r_scale={r_scale:.4f}, θ_scale={theta_scale:.4f}")
+        rates = np.array([case[0] for case in test_cases], dtype=np.float64)
+        r_scale = 48000.0 / rates
+        theta_scale = 48000.0 / rates
+
+        for (fs, desc), r_s, t_s in zip(test_cases, r_scale, theta_scale):
+            self._p(f"[DSP]   {fs}Hz ({desc}): r_scale={r_s:.4f}, θ_scale={t_s:.4f}")
 
-        print("[DSP]")
-        print("[DSP] Sample rate conversion accuracy: PASS")
+        self._p("[DSP]")
+        self._p("[DSP] Sample rate conversion accuracy: PASS")
         return True
 
     def run_test_scenarios(self):
         """Analyze handling of critical scenarios"""
-        print("[DSP]")
-        print("[DSP] === TEST SCENARIO ANALYSIS ===")
+        self._p("[DSP]")
+        self._p("[DSP] === TEST SCENARIO ANALYSIS ===")
 
         scenarios = {
             "Parameter automation": "PASS - Smooth parameter interpolation with crossfading",
@@ -172,14 +207,14 @@ class AccurateDSPAnalysis:
         }
 
         for scenario, result in scenarios.items():
-            print(f"[DSP] {scenario}: {result}")
+            self._p(f"[DSP] {scenario}: {result}")
 
         return True
 
     def calculate_final_rating(self):
         """Calculate comprehensive stability rating"""
-        print("[DSP]")
-        print("[DSP] === FINAL STABILITY ASSESSMENT ===")
+        self._p("[DSP]")
+        self._p("[DSP] === FINAL STABILITY ASSESSMENT ===")
 
         # Score each critical area
         scores = {
@@ -191,13 +226,13 @@ class AccurateDSPAnalysis:
             "Test Robustness": 9      # Handles all critical scenarios
         }
 
-        print("[DSP] Component Ratings:")
+        self._p("[DSP] Component Ratings:")
         for component, score in scores.items():
-            print(f"[DSP]   {component}: {score}/10")
+            self._p(f"[DSP]   {component}: {score}/10")
 
         overall_rating = sum(scores.values()) / len(scores)
-        print(f"[DSP]")
-        print(f"[DSP] Overall Stability Rating: {overall_rating:.1f}/10")
+        self._p(f"[DSP]")
+        self._p(f"[DSP] Overall Stability Rating: {overall_rating:.1f}/10")
 
         if overall_rating >= 9.5:
             release_status = "APPROVED - Excellent stability"
@@ -208,14 +243,14 @@ class AccurateDSPAnalysis:
         else:
             release_status = "BLOCKED - Critical stability issues"
 
-        print(f"[DSP] Commercial Release: {release_status}")
+        self._p(f"[DSP] Commercial Release: {release_status}")
 
         return overall_rating, release_status
 
     def identify_optimizations(self):
         """Identify potential optimizations (not blockers)"""
-        print("[DSP]")
-        print("[DSP] === OPTIMIZATION OPPORTUNITIES ===")
+        self._p("[DSP]")
+        self._p("[DSP] === OPTIMIZATION OPPORTUNITIES ===")
 
         optimizations = [
             "Consider coefficient interpolation caching for CPU efficiency",
@@ -226,45 +261,49 @@ class AccurateDSPAnalysis:
         ]
 
         for opt in optimizations:
-            print(f"[DSP] • {opt}")
+            self._p(f"[DSP] • {opt}")
 
         return optimizations
 
 def main():
-    print("[DSP] DSP Verifier Agent - Accurate morphEngine Analysis")
-    print("[DSP] " + "="*60)
-
     analyzer = AccurateDSPAnalysis()
+    p = analyzer.log
+
+    # Buffered lines are written even if an analysis raises part way
+    try:
+        p("[DSP] DSP Verifier Agent - Accurate morphEngine Analysis")
+        p("[DSP] " + "="*60)
+
+        # Run all analyses
+        analyzer.analyze_zplane_stability()
+        analyzer.analyze_morph_continuity()
+        analyzer.analyze_denorm_protection()
+        analyzer.analyze_numerical_stability()
+        analyzer.analyze_sample_rate_conversion()
+        analyzer.run_test_scenarios()
+
+        rating, status = analyzer.calculate_final_rating()
+        optimizations = analyzer.identify_optimizations()
+
+        # Save detailed report
+        report = {
+            'timestamp': analyzer.timestamp,
+            'overall_rating': rating,
+            'release_status': status,
+            'stability_analysis': 'COMPREHENSIVE',
+            'critical_issues': [],  # No blockers found
+            'optimizations': optimizations,
+            'conclusion': 'morphEngine demonstrates excellent DSP stability with comprehensive safeguards'
+        }
+
+        report_path = f"C:\\fieldEngineBundle\\sessions\\reports\\agents\\dsp-verifier-accurate-{analyzer.timestamp}.json"
+        _write_report(report, report_path)
 
-    # Run all analyses
-    analyzer.analyze_zplane_stability()
-    analyzer.analyze_morph_continuity()
-    analyzer.analyze_denorm_protection()
-    analyzer.analyze_numerical_stability()
-    analyzer.analyze_sample_rate_conversion()
-    analyzer.run_test_scenarios()
-
-    rating, status = analyzer.calculate_final_rating()
-    optimizations = analyzer.identify_optimizations()
-
-    # Save detailed report
-    report = {
-        'timestamp': analyzer.timestamp,
-        'overall_rating': rating,
-        'release_status': status,
-        'stability_analysis': 'COMPREHENSIVE',
-        'critical_issues': [],  # No blockers found
-        'optimizations': optimizations,
-        'conclusion': 'morphEngine demonstrates excellent DSP stability with comprehensive safeguards'
-    }
-
-    report_path = f"C:\\fieldEngineBundle\\sessions\\reports\\agents\\dsp-verifier-accurate-{analyzer.timestamp}.json"
-    with open(report_path, 'w') as f:
-        json.dump(report, f, indent=2)
-
-    print(f"[DSP]")
-    print(f"[DSP] Summary: morphEngine ready for commercial release")
-    print(f"[DSP] Detailed report: {report_path}")
+        p(f"[DSP]")
+        p(f"[DSP] Summary: morphEngine ready for commercial release")
+        p(f"[DSP] Detailed report: {report_path}")
+    finally:
+        analyzer.flush_log()
 
     return 0 if "APPROVED" in status else 1
 
@@ -7,6 +7,7 @@ Analyzes Z-plane filter stability, morph transitions, and numerical hotspots
 per commercial release requirements.
 """
 
+import functools
 import json
 import numpy as np
 import matplotlib.pyplot as plt
@@ -14,9 +15,101 @@ from datetime import datetime
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+# Simplified pole model used by the SOS stability sweep
+SWEEP_R_BASE = 0.98
+SWEEP_THETA_BASE = np.pi/4
+
+# Pole radius compliance bounds at 44.1kHz (from DSP research)
+R_MIN_44K = 0.996
+R_MAX_44K = 0.997
+
+# Plugin sample rates that get a precomputed scaling table entry
+SUPPORTED_RATES = (8000, 44100, 48000, 88200, 96000, 192000)
+
+def _build_sr_table(rates):
+    """Per-rate matched-Z scale factors and pole radius bounds"""
+    return {
+        fs: dict(
+            r_scale=48000.0 / fs,       # r = r_ref ** r_scale
+            theta_scale=48000.0 / fs,   # theta = theta_ref * theta_scale
+            r_min=R_MIN_44K ** (44100.0 / fs),
+            r_max=R_MAX_44K ** (44100.0 / fs),
+        )
+        for fs in rates
+    }
+
+def _stability_masks_numpy(r, theta, r_min, r_max, n_morph):
+    """Return (stable, unstable) masks over the sample rate x morph grid
+
+    r, theta, r_min and r_max hold one value per sample rate.
+    """
+    grid_shape = (len(r), n_morph)
+    r = np.broadcast_to(r[:, None], grid_shape)
+    theta = np.broadcast_to(theta[:, None], grid_shape)
+
+    # Pole must be inside unit circle with safety margin
+    radius_ok = (r < 1.0) & (r >= r_min[:, None]) & (r <= r_max[:, None])
+
+    # Check biquad stability via Schur triangle; one scratch block holds
+    # every intermediate so large sweeps do not allocate per ufunc
+    a1, a2, bound = np.empty((3,) + grid_shape)
+    np.cos(theta, out=a1)
+    np.multiply(a1, r, out=a1)
+    np.multiply(a1, -2.0, out=a1)
+    np.multiply(r, r, out=a2)
+
+    # Stability conditions: |a2| < 1, |a1| < 1 + a2
+    np.add(a2, 1.0, out=bound)
+    np.abs(a1, out=a1)
+    np.abs(a2, out=a2)
+    schur_ok = np.less(a2, 1.0)
+    schur_ok &= np.less(a1, bound)
+
+    return radius_ok & schur_ok, radius_ok & ~schur_ok
+
+def _eval_cascade(sos, x):
+    """Run x through an SOS biquad cascade (rows: b0 b1 b2 a0 a1 a2)"""
+    # Imported here: scipy.signal is slow to import and only this scenario needs it
+    from scipy.signal import sosfilt
+    return sosfilt(sos, x)
+
+def _cascade_response(sos, omega):
+    """Complex response of an SOS cascade, H = prod_k H_k(e^jw)"""
+    z = np.exp(-1j * np.asarray(omega))[None, :]
+    b0, b1, b2, a0, a1, a2 = (sos[:, k:k+1] for k in range(6))
+    num = b0 + b1 * z + b2 * z * z
+    den = a0 + a1 * z + a2 * z * z
+    return np.prod(num / den, axis=0)
+
+def _write_report(report, path):
+    """Write a report as indented JSON, via orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+# Report timestamp format; one timestamp is shared by every instance in a run
+_TS_FMT = "%Y%m%d_%H%M%S"
+
+@functools.cache
+def _now_ts():
+    return datetime.now().strftime(_TS_FMT)
+
 class DSPVerifier:
     def __init__(self):
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Output lines are buffered and written once per run
+        self._log = []
+        self._p = self._log.append
+        self.timestamp = _now_ts()
+        self._sr_table = _build_sr_table(SUPPORTED_RATES)
+
         self.report = {
             'timestamp': self.timestamp,
             'sos_stability': {},
@@ -30,45 +123,27 @@ class DSPVerifier:
 
     def check_sos_stability(self, poles_data):
         """Check SOS cascade stability across parameter ranges"""
-        print("[DSP] === SOS STABILITY CHECK ===")
+        self._p("[DSP] === SOS STABILITY CHECK ===")
 
-        stable_configs = 0
-        total_configs = 0
-        unstable_filters = []
-
-        # Analyze different morph positions and sample rates
+        # Analyze different morph positions and sample rates as one grid
         sample_rates = [44100, 48000, 88200, 96000]
         morph_positions = np.linspace(0, 0.85, 33)  # Match ZPlaneStyle range
+        rates = [self._sr_table[fs] for fs in sample_rates]
 
-        for fs in sample_rates:
-            for morph_pos in morph_positions:
-                total_configs += 1
-
-                # Simulate pole interpolation (simplified)
-                r_base = 0.98
-                theta_base = np.pi/4
+        # Sample rate scaling (matched-Z transform) of the simplified pole
+        r = SWEEP_R_BASE ** np.array([t['r_scale'] for t in rates])
+        theta = SWEEP_THETA_BASE * np.array([t['theta_scale'] for t in rates])
+        r_min = np.array([t['r_min'] for t in rates])
+        r_max = np.array([t['r_max'] for t in rates])
 
-                # Sample rate scaling (matched-Z transform)
-                r = r_base ** (48000.0 / fs)
-                theta = theta_base * (48000.0 / fs)
+        stable, unstable = _stability_masks_numpy(r, theta, r_min, r_max, len(morph_positions))
 
-                # Check pole radius compliance (from DSP research)
-                r_min_44k = 0.996
-                r_max_44k = 0.997
-                r_min = r_min_44k ** (44100.0 / fs)
-                r_max = r_max_44k ** (44100.0 / fs)
-
-                # Pole must be inside unit circle with safety margin
-                if r < 1.0 and r >= r_min and r <= r_max:
-                    # Check biquad stability via Schur triangle
-                    a1 = -2.0 * r * np.cos(theta)
-                    a2 = r * r
-
-                    # Stability conditions: |a2| < 1, |a1| < 1 + a2
-                    if abs(a2) < 1.0 and abs(a1) < (1.0 + a2):
-                        stable_configs += 1
-                    else:
-                        unstable_filters.append(f"Fs={fs}Hz, morph={morph_pos:.3f}")
+        total_configs = stable.size
+        stable_configs = int(np.count_nonzero(stable))
+        unstable_filters = [
+            f"Fs={sample_rates[i]}Hz, morph={morph_positions[j]:.3f}"
+            for i, j in np.argwhere(unstable)
+        ]
 
         stability_percentage = (stable_configs / total_configs) * 100
 
@@ -79,13 +154,13 @@ class DSPVerifier:
         else:
             status = "UNSTABLE"
 
-        print(f"[DSP] morphEngine_ZPlane: {status}")
-        print(f"[DSP] Stability: {stability_percentage:.2f}% ({stable_configs}/{total_configs})")
+        self._p(f"[DSP] morphEngine_ZPlane: {status}")
+        self._p(f"[DSP] Stability: {stability_percentage:.2f}% ({stable_configs}/{total_configs})")
 
         if unstable_filters:
-            print(f"[DSP] Unstable configs: {len(unstable_filters)}")
+            self._p(f"[DSP] Unstable configs: {len(unstable_filters)}")
             for config in unstable_filters[:5]:  # Show first 5
-                print(f"[DSP]   {config}")
+                self._p(f"[DSP]   {config}")
 
         self.report['sos_stability']['status'] = status
         self.report['sos_stability']['percentage'] = stability_percentage
@@ -95,38 +170,30 @@ class DSPVerifier:
 
     def check_morph_continuity(self):
         """Validate smooth coefficient transitions during morphs"""
-        print("[DSP]")
-        print("[DSP] === MORPH CONTINUITY ===")
+        self._p("[DSP]")
+        self._p("[DSP] === MORPH CONTINUITY ===")
 
         # Simulate coefficient changes across morph range
         morph_steps = np.linspace(0, 0.85, 100)
-        prev_coeffs = None
-        max_jump = 0.0
-        jump_positions = []
 
-        for i, morph in enumerate(morph_steps):
-            # Simulate smoothstep easing: x*x*(3-2*x)
-            eased_morph = morph * morph * (3.0 - 2.0 * morph)
+        # Simulate smoothstep easing: x*x*(3-2*x)
+        eased_morph = morph_steps * morph_steps * (3.0 - 2.0 * morph_steps)
 
-            # Simulate pole interpolation
-            r = 0.98 + 0.015 * eased_morph  # Example interpolation
-            theta = (np.pi/6) + (np.pi/3) * eased_morph
+        # Simulate pole interpolation
+        r = 0.98 + 0.015 * eased_morph  # Example interpolation
+        theta = (np.pi/6) + (np.pi/3) * eased_morph
 
-            # Convert to biquad coefficients
-            a1 = -2.0 * r * np.cos(theta)
-            a2 = r * r
+        # Convert to biquad coefficients
+        a1 = -2.0 * r * np.cos(theta)
+        a2 = r * r
 
-            current_coeffs = np.array([a1, a2])
+        # Coefficient jump between consecutive steps
+        jumps = np.hypot(np.diff(a1), np.diff(a2))
+        max_jump = float(jumps.max())
 
-            if prev_coeffs is not None:
-                jump = np.linalg.norm(current_coeffs - prev_coeffs)
-                max_jump = max(max_jump, jump)
-
-                # Flag large coefficient jumps
-                if jump > 0.05:  # Threshold for perceptible artifacts
-                    jump_positions.append((morph, jump))
-
-            prev_coeffs = current_coeffs
+        # Flag large coefficient jumps
+        large = np.flatnonzero(jumps > 0.05)  # Threshold for perceptible artifacts
+        jump_positions = [(morph_steps[i + 1], jumps[i]) for i in large]
 
         # Check crossfade implementation (from ZPlaneStyle.cpp)
         crossfade_threshold = 0.1  # kLargeJumpThreshold
@@ -141,15 +208,15 @@ class DSPVerifier:
         else:
             status = "FAIL"
 
-        print(f"[DSP] Transition smoothness: {status}")
-        print(f"[DSP] Max coefficient jump: {max_jump:.6f}")
-        print(f"[DSP] Crossfade threshold: {crossfade_threshold}")
-        print(f"[DSP] Crossfade length: {crossfade_length} samples")
+        self._p(f"[DSP] Transition smoothness: {status}")
+        self._p(f"[DSP] Max coefficient jump: {max_jump:.6f}")
+        self._p(f"[DSP] Crossfade threshold: {crossfade_threshold}")
+        self._p(f"[DSP] Crossfade length: {crossfade_length} samples")
 
         if jump_positions:
-            print(f"[DSP] Large jumps detected: {len(jump_positions)}")
+            self._p(f"[DSP] Large jumps detected: {len(jump_positions)}")
             for pos, jump in jump_positions[:3]:  # Show first 3
-                print(f"[DSP]   morph={pos:.3f}: jump={jump:.6f}")
+                self._p(f"[DSP]   morph={pos:.3f}: jump={jump:.6f}")
 
         self.report['morph_continuity']['status'] = status
         self.report['morph_continuity']['max_jump'] = max_jump
@@ -157,49 +224,54 @@ class DSPVerifier:
 
         return status in ["PASS", "ACCEPTABLE"]
 
-    def check_denorm_hotspots(self):
-        """Identify denormalization hotspots and mitigation effectiveness"""
-        print("[DSP]")
-        print("[DSP] === DENORM HOTSPOTS ===")
-
+    def _denorm_hotspots_one_fs(self, fs):
+        """Coefficient hotspots for a single sample rate"""
         hotspots = []
 
-        # Check coefficient ranges that could generate subnormals
-        sample_rates = [44100, 48000, 96000]
+        # Very low frequencies (high Q poles near unit circle)
+        r_high_q = 0.999  # Close to unit circle
+        theta_low = 2 * np.pi * 20.0 / fs  # 20 Hz
+
+        a1 = -2.0 * r_high_q * np.cos(theta_low)
+        a2 = r_high_q * r_high_q
 
-        for fs in sample_rates:
-            # Very low frequencies (high Q poles near unit circle)
-            r_high_q = 0.999  # Close to unit circle
-            theta_low = 2 * np.pi * 20.0 / fs  # 20 Hz
+        # Check for near-zero coefficients that could denormalize
+        if abs(a1) < 1e-30 or abs(a2) < 1e-30:
+            hotspots.append(f"Near-zero coeffs at {fs}Hz: a1={a1:.2e}, a2={a2:.2e}")
 
-            a1 = -2.0 * r_high_q * np.cos(theta_low)
-            a2 = r_high_q * r_high_q
+        # High frequency poles (theta near pi)
+        theta_high = np.pi * 0.99
+        a1_high = -2.0 * r_high_q * np.cos(theta_high)
 
-            # Check for near-zero coefficients that could denormalize
-            if abs(a1) < 1e-30 or abs(a2) < 1e-30:
-                hotspots.append(f"Near-zero coeffs at {fs}Hz: a1={a1:.2e}, a2={a2:.2e}")
+        if abs(a1_high) > 1.98:  # Near coefficient overflow
+            hotspots.append(f"High-freq overflow risk at {fs}Hz: a1={a1_high:.6f}")
 
-            # High frequency poles (theta near pi)
-            theta_high = np.pi * 0.99
-            a1_high = -2.0 * r_high_q * np.cos(theta_high)
+        return hotspots
 
-            if abs(a1_high) > 1.98:  # Near coefficient overflow
-                hotspots.append(f"High-freq overflow risk at {fs}Hz: a1={a1_high:.6f}")
+    def check_denorm_hotspots(self):
+        """Identify denormalization hotspots and mitigation effectiveness"""
+        self._p("[DSP]")
+        self._p("[DSP] === DENORM HOTSPOTS ===")
 
         # Check state variable flush thresholds (from MorphFilter.cpp)
         denorm_threshold = 1.0e-20  # From code
 
+        # Check coefficient ranges that could generate subnormals
+        sample_rates = [44100, 48000, 96000]
+
+        hotspots = [h for fs in sample_rates for h in self._denorm_hotspots_one_fs(fs)]
+
         # Verify FTZ/DAZ protection is enabled (from both files)
         ftz_daz_enabled = True  # juce::ScopedNoDenormals found in code
 
-        print(f"[DSP] FTZ/DAZ protection: {'ENABLED' if ftz_daz_enabled else 'MISSING'}")
-        print(f"[DSP] State flush threshold: {denorm_threshold:.1e}")
+        self._p(f"[DSP] FTZ/DAZ protection: {'ENABLED' if ftz_daz_enabled else 'MISSING'}")
+        self._p(f"[DSP] State flush threshold: {denorm_threshold:.1e}")
 
         if hotspots:
             for hotspot in hotspots:
-                print(f"[DSP] HOTSPOT: {hotspot}")
+                self._p(f"[DSP] HOTSPOT: {hotspot}")
         else:
-            print(f"[DSP] No critical hotspots detected")
+            self._p(f"[DSP] No critical hotspots detected")
 
         # Additional mitigations found in code:
         mitigations = [
@@ -210,7 +282,7 @@ class DSPVerifier:
         ]
 
         for mitigation in mitigations:
-            print(f"[DSP] Mitigation: {mitigation}")
+            self._p(f"[DSP] Mitigation: {mitigation}")
 
         self.report['denorm_hotspots'] = hotspots
         self.report['denorm_mitigations'] = mitigations
@@ -219,15 +291,15 @@ class DSPVerifier:
 
     def check_numerical_ranges(self):
         """Verify coefficients stay within safe numerical ranges"""
-        print("[DSP]")
-        print("[DSP] === NUMERICAL RANGE VALIDATION ===")
+        self._p("[DSP]")
+        self._p("[DSP] === NUMERICAL RANGE VALIDATION ===")
 
         issues = []
 
         # Check coefficient bounds from ZPlaneStyle implementation
         pole_radius_bounds = {
-            'min_44k': 0.996,
-            'max_44k': 0.997,
+            'min_44k': R_MIN_44K,
+            'max_44k': R_MAX_44K,
             'absolute_max': 0.9995  # Safety limit
         }
 
@@ -238,7 +310,7 @@ class DSPVerifier:
         fs_min, fs_max = 8000, 192000  # Reasonable plugin range
 
         for fs in [fs_min, fs_max]:
-            r_scaled = pole_radius_bounds['max_44k'] ** (44100.0 / fs)
+            r_scaled = self._sr_table[fs]['r_max']
             if r_scaled >= 1.0:
                 issues.append(f"Pole radius overflow at {fs}Hz: r={r_scaled:.6f}")
             elif r_scaled < 0.1:
@@ -248,18 +320,27 @@ class DSPVerifier:
         section_scale_found = True  # Per-section normalization implemented
         cascade_scale_found = True  # Global cascade scaling implemented
 
-        print(f"[DSP] Pole radius bounds: {pole_radius_bounds}")
-        print(f"[DSP] Theta wrapping: {'PROTECTED' if theta_protection else 'VULNERABLE'}")
-        print(f"[DSP] Section scaling: {'ENABLED' if section_scale_found else 'MISSING'}")
-        print(f"[DSP] Cascade scaling: {'ENABLED' if cascade_scale_found else 'MISSING'}")
+        # Peak magnitude of the morph-range cascade (unnormalized sections)
+        omega = np.linspace(0, np.pi, 2048)
+        magnitude = np.abs(_cascade_response(self._morph_cascade_sos(), omega))
+        cascade_peak_db = float(20.0 * np.log10(magnitude.max()))
+        if not np.isfinite(cascade_peak_db):
+            issues.append("Cascade frequency response is not finite")
+
+        self._p(f"[DSP] Pole radius bounds: {pole_radius_bounds}")
+        self._p(f"[DSP] Raw cascade peak gain: {cascade_peak_db:.1f} dB")
+        self._p(f"[DSP] Theta wrapping: {'PROTECTED' if theta_protection else 'VULNERABLE'}")
+        self._p(f"[DSP] Section scaling: {'ENABLED' if section_scale_found else 'MISSING'}")
+        self._p(f"[DSP] Cascade scaling: {'ENABLED' if cascade_scale_found else 'MISSING'}")
 
         if issues:
             for issue in issues:
-                print(f"[DSP] RANGE ISSUE: {issue}")
+                self._p(f"[DSP] RANGE ISSUE: {issue}")
         else:
-            print(f"[DSP] All numerical ranges within safe bounds")
+            self._p(f"[DSP] All numerical ranges within safe bounds")
 
         self.report['numerical_ranges']['issues'] = issues
+        self.report['numerical_ranges']['cascade_peak_db'] = cascade_peak_db
         self.report['numerical_ranges']['protections'] = {
             'theta_wrapping': theta_protection,
             'section_scaling': section_scale_found,
@@ -268,10 +349,40 @@ class DSPVerifier:
 
         return len(issues) == 0
 
+    def _morph_cascade_sos(self, sections=6):
+        """All-pole SOS cascade with one section per morph position"""
+        # Same pole model as check_morph_continuity
+        morph = np.linspace(0, 0.85, sections)
+        eased_morph = morph * morph * (3.0 - 2.0 * morph)
+        r = 0.98 + 0.015 * eased_morph
+        theta = (np.pi/6) + (np.pi/3) * eased_morph
+
+        a1 = -2.0 * r * np.cos(theta)
+        a2 = r * r
+        ones = np.ones_like(a1)
+        zeros = np.zeros_like(a1)
+        return np.stack([ones, zeros, zeros, ones, a1, a2], axis=1)
+
+    def _simulate_impulse(self, sos, length=8192):
+        """Impulse response of an SOS cascade"""
+        impulse = np.zeros(length)
+        impulse[0] = 1.0
+        return _eval_cascade(sos, impulse)
+
+    def _impulse_decays(self):
+        """Check the morph-range cascade impulse response dies out"""
+        y = np.abs(self._simulate_impulse(self._morph_cascade_sos()))
+        if not np.all(np.isfinite(y)):
+            return False
+
+        # Last 10% of the response must sit 120dB below its peak
+        tail = y[-(len(y) // 10):]
+        return tail.max() < 1e-6 * y.max()
+
     def run_test_scenarios(self):
         """Execute critical test scenarios"""
-        print("[DSP]")
-        print("[DSP] === CRITICAL TEST SCENARIOS ===")
+        self._p("[DSP]")
+        self._p("[DSP] === CRITICAL TEST SCENARIOS ===")
 
         scenarios = [
             "Parameter automation sweeps",
@@ -292,11 +403,13 @@ class DSPVerifier:
                 result = "PASS_WITH_CROSSFADE"  # Crossfading handles this
             elif "extended" in scenario.lower():
                 result = "PASS_WITH_MONITORING"  # Energy monitoring handles this
+            elif "impulse" in scenario.lower():
+                result = "PASS" if self._impulse_decays() else "FAIL_NO_DECAY"
             else:
                 result = "PASS"
 
             test_results[scenario] = result
-            print(f"[DSP] {scenario}: {result}")
+            self._p(f"[DSP] {scenario}: {result}")
 
         self.report['test_scenarios'] = test_results
 
@@ -370,69 +483,78 @@ class DSPVerifier:
         self.report['recommendations'] = recommendations
         return recommendations
 
+    def flush_log(self):
+        """Write buffered output lines to stdout in a single call"""
+        if self._log:
+            sys.stdout.write('\n'.join(self._log) + '\n')
+            self._log.clear()
+
     def save_report(self):
         """Save detailed report to JSON"""
         report_path = f"C:\\fieldEngineBundle\\sessions\\reports\\agents\\dsp-verifier-{self.timestamp}.json"
 
-        with open(report_path, 'w') as f:
-            json.dump(self.report, f, indent=2)
+        _write_report(self.report, report_path)
 
-        print(f"[DSP]")
-        print(f"[DSP] Report saved: {report_path}")
+        self._p(f"[DSP]")
+        self._p(f"[DSP] Report saved: {report_path}")
 
         return report_path
 
     def run_full_analysis(self):
         """Run complete DSP verification analysis"""
-        print("[DSP] DSP Verifier Agent - morphEngine Stability Analysis")
-        print("[DSP] " + "="*50)
-
-        # Run all checks
-        sos_stable = self.check_sos_stability(None)
-        morph_smooth = self.check_morph_continuity()
-        denorm_clean = self.check_denorm_hotspots()
-        ranges_safe = self.check_numerical_ranges()
-        tests_pass = self.run_test_scenarios()
-
-        # Calculate rating and recommendations
-        rating = self.calculate_stability_rating()
-        recommendations = self.generate_recommendations()
-
-        # Summary
-        print("[DSP]")
-        print("[DSP] === SUMMARY ===")
-
-        overall_status = "PASS" if all([sos_stable, morph_smooth, denorm_clean,
-                                       ranges_safe, tests_pass]) else "FAIL"
-
-        print(f"[DSP] Overall Status: {overall_status}")
-        print(f"[DSP] Stability Rating: {rating:.1f}/10")
-
-        if rating >= 9.0:
-            print("[DSP] Commercial Release: APPROVED")
-        elif rating >= 7.0:
-            print("[DSP] Commercial Release: CONDITIONAL (minor issues)")
-        else:
-            print("[DSP] Commercial Release: BLOCKED (stability concerns)")
-
-        # Identify blockers
-        if overall_status == "FAIL":
-            print("[DSP]")
-            print("[DSP] STABILITY BLOCKERS:")
-            if not sos_stable:
-                print("[DSP] - SOS cascade instability detected")
-            if not ranges_safe:
-                print("[DSP] - Numerical range violations found")
-            if not tests_pass:
-                print("[DSP] - Critical test scenarios failed")
-
-        self.report['overall_status'] = overall_status
-        self.report['commercial_release'] = "APPROVED" if rating >= 9.0 else "CONDITIONAL" if rating >= 7.0 else "BLOCKED"
-
-        # Save report
-        self.save_report()
-
-        return rating, overall_status
+        # Buffered lines are written even if a check raises part way
+        try:
+            self._p("[DSP] DSP Verifier Agent - morphEngine Stability Analysis")
+            self._p("[DSP] " + "="*50)
+
+            # Run all checks
+            sos_stable = self.check_sos_stability(None)
+            morph_smooth = self.check_morph_continuity()
+            denorm_clean = self.check_denorm_hotspots()
+            ranges_safe = self.check_numerical_ranges()
+            tests_pass = self.run_test_scenarios()
+
+            # Calculate rating and recommendations
+            rating = self.calculate_stability_rating()
+            recommendations = self.generate_recommendations()
+
+            # Summary
+            self._p("[DSP]")
+            self._p("[DSP] === SUMMARY ===")
+
+            overall_status = "PASS" if all([sos_stable, morph_smooth, denorm_clean,
+                                           ranges_safe, tests_pass]) else "FAIL"
+
+            self._p(f"[DSP] Overall Status: {overall_status}")
+            self._p(f"[DSP] Stability Rating: {rating:.1f}/10")
+
+            if rating >= 9.0:
+                self._p("[DSP] Commercial Release: APPROVED")
+            elif rating >= 7.0:
+                self._p("[DSP] Commercial Release: CONDITIONAL (minor issues)")
+            else:
+                self._p("[DSP] Commercial Release: BLOCKED (stability concerns)")
+
+            # Identify blockers
+            if overall_status == "FAIL":
+                self._p("[DSP]")
+                self._p("[DSP] STABILITY BLOCKERS:")
+                if not sos_stable:
+                    self._p("[DSP] - SOS cascade instability detected")
+                if not ranges_safe:
+                    self._p("[DSP] - Numerical range violations found")
+                if not tests_pass:
+                    self._p("[DSP] - Critical test scenarios failed")
+
+            self.report['overall_status'] = overall_status
+            self.report['commercial_release'] = "APPROVED" if rating >= 9.0 else "CONDITIONAL" if rating >= 7.0 else "BLOCKED"
+
+            # Save report
+            self.save_report()
+
+            return rating, overall_status
+        finally:
+            self.flush_log()
 
 if __name__ == "__main__":
     verifier = DSPVerifier()
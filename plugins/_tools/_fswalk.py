@@ -0,0 +1,33 @@
+"""
+Internal: lazy, sorted directory walk shared by the pack tools.
+
+Yields the same paths, in the same order, as sorted(root.rglob(pattern)) for
+a plain file-name pattern, but one directory at a time so callers that stop
+early (e.g. --limit) never enumerate the rest of the tree.
+"""
+import fnmatch
+import os
+from pathlib import Path
+
+def walk_files(root: Path, pattern: str = '*.bin'):
+    """Yield files under root whose name matches pattern, in sorted order."""
+    # rglob('**/x') and rglob('x') both mean "x at any depth"
+    if pattern.startswith('**/'):
+        pattern = pattern[3:]
+    if '/' in pattern or pattern == '**':
+        # Path-shaped patterns keep full glob semantics
+        yield from sorted(p for p in root.rglob(pattern) if p.is_file())
+        return
+    yield from _walk(os.fspath(root), pattern)
+
+def _walk(top: str, pattern: str):
+    try:
+        with os.scandir(top) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            yield from _walk(e.path, pattern)
+        elif fnmatch.fnmatch(e.name, pattern) and e.is_file():
+            yield Path(e.path)
@@ -0,0 +1,26 @@
+"""
+Internal: JSON output shared by the pack tools.
+
+Output is 2-space indented JSON, written with orjson when it is installed and
+with stdlib json otherwise.
+"""
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+def dumps_json(obj) -> bytes:
+    """obj as 2-space indented JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def write_json(path: Path, obj) -> None:
+    """Write obj as 2-space indented JSON, via orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(obj, indent=2))
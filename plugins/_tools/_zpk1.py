@@ -0,0 +1,80 @@
+"""
+Internal: ZPK1 pack reading shared by the pack tools.
+
+Layout (see sysex_pack.pack):
+  header: magic(4) version(u16) count(u16)
+  table[count]: id(u32) type(u16) sub(u16) flags(u16) offset(u32) length(u32)
+  blobs: concatenated data
+"""
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'ZPK1'
+HDR = struct.Struct('<4sHH')
+
+# Table entry layout as a structured dtype (packed, 18 bytes)
+ENTRY_DTYPE = np.dtype([('id', '<u4'), ('typ', '<u2'), ('sub', '<u2'),
+                        ('flags', '<u2'), ('offset', '<u4'), ('length', '<u4')])
+
+# Page-cache hints are POSIX-only (absent on Windows and macOS)
+_HAVE_FADVISE = hasattr(os, 'posix_fadvise')
+
+@contextmanager
+def open_pack(path: Path, *, header_only: bool = False):
+    """Yield (mapping, table) for a ZPK1 v1 pack, or None if path is not one.
+
+    Blobs are read by slicing the mapping, which copies only what is used;
+    the table is a copy, so it stays valid after the block exits.
+    header_only callers promise not to touch blobs: readahead is not
+    widened, and the file's pages are dropped from the cache afterwards.
+    """
+    with path.open('rb') as f:
+        fd = f.fileno()
+        if _HAVE_FADVISE and not header_only:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        try:
+            if os.fstat(fd).st_size < HDR.size:
+                yield None
+                return
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                magic, ver, count = HDR.unpack_from(mm)
+                if magic != MAGIC or ver != 1:
+                    yield None
+                    return
+                table = np.frombuffer(mm, dtype=ENTRY_DTYPE, count=count, offset=HDR.size).copy()
+                yield mm, table
+        finally:
+            if _HAVE_FADVISE and header_only:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+# One read covers header + table of typical packs (~220 entries)
+_HEAD_READ = 4096
+
+def read_table(path: Path):
+    """The pack's entry table as an ENTRY_DTYPE array, or None"""
+    if not hasattr(os, 'pread'):  # Windows: go through the mapping
+        with open_pack(path, header_only=True) as pack:
+            return None if pack is None else pack[1]
+    # open + one pread + close per pack; a second pread only for big tables
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        head = os.pread(fd, _HEAD_READ, 0)
+        if len(head) < HDR.size:
+            return None
+        magic, ver, count = HDR.unpack_from(head)
+        if magic != MAGIC or ver != 1:
+            return None
+        need = HDR.size + count * ENTRY_DTYPE.itemsize
+        if need > len(head):
+            head += os.pread(fd, need - len(head), len(head))
+        # frombuffer raises on a truncated table, like the mapped path
+        return np.frombuffer(head, dtype=ENTRY_DTYPE, count=count, offset=HDR.size).copy()
+    finally:
+        if _HAVE_FADVISE:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        os.close(fd)
@@ -1,20 +1,21 @@
 #!/usr/bin/env python3
-import argparse, json, struct
+import argparse, itertools, os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from _fswalk import walk_files
+from _jsonio import write_json
+from _zpk1 import open_pack
+
 def scan_pack(path: Path):
-    b = path.read_bytes()
-    if b[:4] != b'ZPK1':
-        return []
-    ver, count = struct.unpack_from('<HH', b, 4)
-    if ver != 1:
-        return []
-    esz = 4+2+2+2+4+4
-    out = []
-    for i in range(count):
-        id_, typ, sub, flags, offd, ln = struct.unpack_from('<IHHHII', b, 8 + i*esz)
-        if typ == 0x10 and sub == 0x22 and ln == 14:
-            data = b[offd:offd+ln]
+    with open_pack(path) as pack:
+        if pack is None:
+            return []
+        mm, table = pack
+        hits = table[(table['typ'] == 0x10) & (table['sub'] == 0x22) & (table['length'] == 14)]
+        out = []
+        for id_, typ, sub, flags, offd, ln in hits.tolist():
+            data = mm[offd:offd+ln]  # copies just this blob out of the map
             out.append({
                 "pack": str(path),
                 "id": id_,
@@ -38,19 +39,29 @@ def main():
     ap.add_argument('--dir', type=Path, required=True)
     ap.add_argument('--out', type=Path, default=Path('plugins/_packs/layer_filters_sample.json'))
     ap.add_argument('--limit', type=int, default=20)
+    ap.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
     args = ap.parse_args()
 
+    # Scan in bounded batches so --limit still stops the directory walk early
     samples = []
-    for p in sorted(args.dir.rglob('*.bin')):
-        samples.extend(scan_pack(p))
-        if len(samples) >= args.limit:
-            break
+    paths = walk_files(args.dir, '*.bin')
+    jobs = args.jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        batch_size = jobs * 4
+        while len(samples) < args.limit:
+            batch = list(itertools.islice(paths, batch_size))
+            if not batch:
+                break
+            for found in ex.map(scan_pack, batch):
+                samples.extend(found)
+                if len(samples) >= args.limit:
+                    break
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps({
+    write_json(args.out, {
         "count": len(samples),
         "items": samples
-    }, indent=2))
+    })
     print(f"Wrote {args.out} with {len(samples)} 0x22 entries")
 
 if __name__ == '__main__':
@@ -1,54 +1,68 @@
 #!/usr/bin/env python3
-import json, struct
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import argparse
 
+from _fswalk import walk_files
+from _jsonio import write_json
+from _zpk1 import read_table
+
+# Entry table plus the per-pack flags the index reports
+PackScan = namedtuple('PackScan', 'table has22 hasFE')
+
 def scan_pack(path: Path):
-    b = path.read_bytes()
-    if b[:4] != b'ZPK1':
-        return None
-    ver, count = struct.unpack_from('<HH', b, 4)
-    if ver != 1:
+    """Return a PackScan for the pack, or None if it is not a ZPK1 v1 pack"""
+    table = read_table(path)
+    if table is None:
         return None
-    esz = 4+2+2+2+4+4
-    entries = []
-    for i in range(count):
-        id_, typ, sub, flags, offd, ln = struct.unpack_from('<IHHHII', b, 8 + i*esz)
-        entries.append({"id": id_, "type": typ, "sub": sub, "flags": flags, "offset": offd, "length": ln})
-    return entries
+    # Classify once: both flags only look at preset (0x10) sub-types
+    preset_subs = table['sub'][table['typ'] == 0x10]
+    return PackScan(table, bool((preset_subs == 0x22).any()), bool((preset_subs == 0xFE).any()))
+
+def entry_dicts(table):
+    """Materialize table rows as JSON-ready dicts"""
+    return [{"id": id_, "type": typ, "sub": sub, "flags": flags, "offset": offd, "length": ln}
+            for id_, typ, sub, flags, offd, ln in table.tolist()]
+
+def index_pack(path: Path):
+    """Index record for one pack, or None; runs in a worker process."""
+    scan = scan_pack(path)
+    if scan is None:
+        return str(path), None
+    return str(path), {
+        "entries": entry_dicts(scan.table),
+        "has_layer_filter_0x22": scan.has22,
+        "has_assembled_preset": scan.hasFE,
+    }
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--dir', type=Path, required=True)
     ap.add_argument('--out', type=Path, default=Path('plugins/_packs/index.json'))
+    ap.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
     args = ap.parse_args()
     out = {}
     total=0
     with_sub22=0
     with_assembled=0
-    for p in sorted(args.dir.rglob('*.bin')):
-        e = scan_pack(p)
-        if e is None:
-            continue
-        total += 1
-        has22 = any(x['type']==0x10 and x['sub']==0x22 for x in e)
-        hasFE = any(x['type']==0x10 and x['sub']==0xFE for x in e)
-        with_sub22 += 1 if has22 else 0
-        with_assembled += 1 if hasFE else 0
-        out[str(p)] = {
-            "entries": e,
-            "has_layer_filter_0x22": has22,
-            "has_assembled_preset": hasFE,
-        }
+    with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+        for key, rec in ex.map(index_pack, walk_files(args.dir, '*.bin'), chunksize=16):
+            if rec is None:
+                continue
+            total += 1
+            with_sub22 += 1 if rec["has_layer_filter_0x22"] else 0
+            with_assembled += 1 if rec["has_assembled_preset"] else 0
+            out[key] = rec
     args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps({
+    write_json(args.out, {
         "summary": {
             "total_packs": total,
             "with_layer_filter_0x22": with_sub22,
             "with_assembled_preset": with_assembled
         },
         "packs": out
-    }, indent=2))
+    })
     print(f"Indexed {total} pack(s). Layer filter 0x22 present in {with_sub22}; assembled in {with_assembled}.")
 
 if __name__ == '__main__':
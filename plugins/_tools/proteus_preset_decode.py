@@ -1,18 +1,8 @@
 #!/usr/bin/env python3
-import struct, sys, json
+import sys, json
 from pathlib import Path
 
-def read_pack(path: Path):
-    b=path.read_bytes()
-    if b[:4]!=b'ZPK1':
-        raise SystemExit('Not a ZPK1 pack')
-    ver,count=struct.unpack_from('<HH',b,4)
-    esz=4+2+2+2+4+4
-    entries=[]
-    for i in range(count):
-        id_,typ,sub,flags,offd,ln=struct.unpack_from('<IHHHII',b,8+i*esz)
-        entries.append((id_,typ,sub,flags,offd,ln))
-    return b,entries
+from _zpk1 import open_pack
 
 def parse_header(data: bytes):
     # Heuristic parse: <preset# (2B?)> <dataBytes 32b> then 10 count bytes
@@ -38,17 +28,20 @@ def parse_header(data: bytes):
 
 def main():
     p=Path(sys.argv[1])
-    b,entries=read_pack(p)
-    hdr=[e for e in entries if e[1]==0x10 and e[2]==0x01]
-    asm=[e for e in entries if e[1]==0x10 and e[2]==0xFE]
     info={}
-    if hdr:
-        off,ln=hdr[0][4],hdr[0][5]
-        data=b[off:off+ln]
-        info['header']=parse_header(data)
-    if asm:
-        off,ln=asm[0][4],asm[0][5]
-        info['assembled_len']=ln
+    with open_pack(p) as pack:
+        if pack is None:
+            raise SystemExit('Not a ZPK1 pack')
+        b,table=pack
+        is_preset=table['typ']==0x10
+        hdr=table[is_preset & (table['sub']==0x01)]
+        asm=table[is_preset & (table['sub']==0xFE)]
+        if len(hdr):
+            off,ln=int(hdr[0]['offset']),int(hdr[0]['length'])
+            data=b[off:off+ln]
+            info['header']=parse_header(data)
+        if len(asm):
+            info['assembled_len']=int(asm[0]['length'])
     print(json.dumps(info,indent=2))
 
 if __name__=='__main__':
@@ -9,40 +9,53 @@ Usage:
     python plugins/_tools/sysex_pack.py --in-dir "C:/fieldEngineBundle/rich data" --out-dir plugins/_packs --spec plugins/_tools/specs/proteus_v22.json
 
 Notes:
-- Pure stdlib; vendor-specific decode hooks are TODO.
+- Pure stdlib (NumPy is used for bulk decodes when installed); vendor-specific
+  decode hooks are TODO.
 - Keep outputs under plugins/ to avoid touching legacy paths.
 - Generates ZMF1 entries for 0x22 messages when models.json is available.
 """
 import argparse
+import functools
 import json
 import struct
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 import math
-import cmath
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up bulk decodes; stdlib is enough
+    np = None
+
+from _fswalk import walk_files
+from _jsonio import dumps_json
 
 MAGIC = b'ZPK1'
 
+# ZPK1 header: magic(4) version(u16) count(u16)
+_HDR = struct.Struct('<4sHH')
+# ZPK1 table entry: id(u32) type(u16) sub(u16) flags(u16) offset(u32) length(u32)
+_ENTRY = struct.Struct('<IHHHII')
+
 def read_syx(path: Path) -> bytes:
     data = path.read_bytes()
     return data
 
 def extract_frames(raw: bytes) -> list[bytes]:
     frames = []
-    i = 0
-    while i < len(raw):
-        if raw[i] == 0xF0:
-            j = i + 1
-            while j < len(raw) and raw[j] != 0xF7:
-                j += 1
-            if j < len(raw) and raw[j] == 0xF7:
-                frames.append(raw[i:j+1])
-                i = j + 1
-                continue
-        i += 1
+    mv = memoryview(raw)
+    i = raw.find(b'\xF0')
+    while i >= 0:
+        j = raw.find(b'\xF7', i + 1)
+        if j < 0:
+            break
+        frames.append(bytes(mv[i:j+1]))
+        i = raw.find(b'\xF0', j + 1)
     return frames
 
-def unpack7(block: bytes) -> bytes:
+def _unpack7_scalar(block: bytes) -> bytes:
     out = bytearray()
     i = 0
     while i < len(block):
@@ -55,12 +68,45 @@ def unpack7(block: bytes) -> bytes:
         i += 8
     return bytes(out)
 
-def _proteus_parse(payload: bytes, spec: dict) -> dict | None:
+_UNPACK7_SHIFTS = np.arange(7, dtype=np.uint8) if np is not None else None
+
+def unpack7(block: bytes) -> bytes:
+    if np is None:
+        return _unpack7_scalar(block)
+    # Full 8-byte groups: OR bit k of each group's MSB byte into data byte k
+    n = len(block) // 8
+    body = np.frombuffer(block, dtype=np.uint8, count=n*8).reshape(n, 8)
+    bits = ((body[:, 0:1] >> _UNPACK7_SHIFTS) & 1) << 7
+    out = (body[:, 1:8] | bits).tobytes()
+    # A trailing partial group goes through the scalar path
+    return out + _unpack7_scalar(block[n*8:])
+
+# Spec fields the per-frame parser needs, normalized once per run
+ProteusSpec = namedtuple('ProteusSpec', 'mids fam editor chk_type')
+
+def _normalize_spec(spec: dict | None) -> ProteusSpec | None:
+    """Reduce a JSON spec to a ProteusSpec; None means no vendor parsing."""
+    if not spec or spec.get('familyId') is None:
+        return None
+    return ProteusSpec(
+        mids=bytes(spec.get('manufacturerId', [])),
+        fam=spec['familyId'],
+        editor=spec.get('editor'),
+        chk_type=(spec.get('checksum') or {}).get('type'),
+    )
+
+def _sum7(data: bytes) -> int:
+    """Sum of all bytes but the trailing checksum (only taken mod 128 by callers)."""
+    # b & 0x7F == b (mod 128), so masking each byte first is unnecessary
+    body = memoryview(data)[:-1]
+    if np is not None and len(body) >= 1024:
+        return int(np.frombuffer(body, dtype=np.uint8).sum(dtype=np.uint64))
+    return sum(body)
+
+def _proteus_parse(payload: bytes, spec: ProteusSpec) -> dict | None:
     # Expect payload starting with manufacturer, family, devId, editor, command
-    mids = bytes(spec.get('manufacturerId', []))
-    fam = spec.get('familyId')
-    editor = spec.get('editor')
-    if not mids or fam is None or editor is None:
+    mids, fam, editor = spec.mids, spec.fam, spec.editor
+    if not mids or editor is None:
         return None
     if len(payload) < len(mids) + 4:
         return None
@@ -78,11 +124,10 @@ def _proteus_parse(payload: bytes, spec: dict) -> dict | None:
     if family != fam or ed != editor:
         return None
     # checksum check (optional)
-    chkspec = spec.get('checksum', {})
-    if chkspec.get('type') == 'ones_complement_7bit' and len(data) >= 1:
+    if spec.chk_type == 'ones_complement_7bit' and len(data) >= 1:
         exp = data[-1] & 0x7F
         if exp != 0x7F:  # 0x7F can mean ignore
-            s = sum(b & 0x7F for b in data[:-1]) & 0x7F
+            s = _sum7(data) & 0x7F
             chk = (~s) & 0x7F
             if chk != exp:
                 # Keep but flag invalid checksum
@@ -92,7 +137,7 @@ def _proteus_parse(payload: bytes, spec: dict) -> dict | None:
                     "cmd": cmd,
                     "sub": sub,
                     "validChecksum": False,
-                    "data": list(data)
+                    "data": data
                 }
     return {
         "family": family,
@@ -100,14 +145,19 @@ def _proteus_parse(payload: bytes, spec: dict) -> dict | None:
         "cmd": cmd,
         "sub": sub,
         "validChecksum": True,
-        "data": list(data)
+        "data": data
     }
 
-def canonize(frames: list[bytes], spec: dict | None = None) -> list[dict]:
+def canonize(frames: list[bytes], spec: ProteusSpec | None = None) -> tuple[list[dict], int]:
+    """Frames -> (entry dicts, next free id); entry 'data' is kept as bytes through the pipeline.
+
+    Ids are frame indices, so the next id is one past the last kept frame.
+    """
     arr: list[dict] = []
+    next_id = 1
     for idx, f in enumerate(frames):
         payload = f[1:-1] if len(f) >= 2 else b''
-        if spec and spec.get('familyId') is not None:
+        if spec is not None:
             meta = _proteus_parse(payload, spec)
             if not meta:
                 continue
@@ -120,16 +170,18 @@ def canonize(frames: list[bytes], spec: dict | None = None) -> list[dict]:
                 },
                 "data": meta["data"]
             })
+            next_id = idx + 1
         else:
             arr.append({
                 "id": idx,
                 "type": 0,
                 "flags": 0,
-                "data": list(payload)
+                "data": payload
             })
-    return arr
+            next_id = idx + 1
+    return arr, next_id
 
-def assemble_preset(entries: list[dict]) -> list[dict]:
+def assemble_preset(entries: list[dict], next_id: int) -> tuple[list[dict], int]:
     """Reassemble Preset data packets (cmd 0x10, sub 0x02 or 0x04) into a single blob per preset.
     Assumes first two bytes of data encode a 14-bit seq number: seq = b0 | (b1<<7). Last byte is checksum.
     """
@@ -140,7 +192,7 @@ def assemble_preset(entries: list[dict]) -> list[dict]:
         t = int(e.get('type', 0))
         meta = e.get('meta') or {}
         sub = int(meta.get('sub') or 0)
-        data = bytes(e.get('data', []))
+        data = e.get('data', b'')
         if t == 0x10 and sub in (0x02, 0x04) and len(data) >= 3:
             seq = data[0] | (data[1] << 7)
             payload = data[2:-1] if len(data) >= 3 else b''  # drop checksum
@@ -155,13 +207,14 @@ def assemble_preset(entries: list[dict]) -> list[dict]:
             assembled += parts[i]
         if assembled:
             entries.append({
-                "id": max([e.get('id', 0) for e in entries] + [0]) + 1,
+                "id": next_id,
                 "type": 0x10,
                 "flags": 0,
                 "meta": {"sub": 0xFE, "assembled": True},
-                "data": list(assembled)
+                "data": bytes(assembled)
             })
-    return entries
+            next_id += 1
+    return entries, next_id
 
 def _parse_preset_header_blob(blob: bytes) -> dict | None:
     # Expect sub at byte0, preset LSB/MSB at 1..2, dataBytes (u32) at 3..6, then 10 counts.
@@ -183,8 +236,12 @@ def _parse_preset_header_blob(blob: bytes) -> dict | None:
 
 # ============= ZMF1 Generation Functions =============
 
+_ZMF1_HDR = struct.Struct('<4sHHBBIH')
+_SECTION = struct.Struct('<fffff')
+
+@functools.lru_cache(maxsize=1)
 def load_zplane_models() -> dict | None:
-    """Load Z-plane models from shared models.json if available."""
+    """Load Z-plane models from shared models.json if available (cached)."""
     models_path = Path(__file__).parent.parent / "_shared" / "zplane" / "models.json"
     if not models_path.exists():
         return None
@@ -224,11 +281,9 @@ def interpolate_poles(poleA: dict, poleB: dict, t: float) -> dict:
 
     # Interpolate angle via shortest path
     diff = thetaB - thetaA
-    # Wrap to [-pi, pi]
-    while diff > math.pi:
-        diff -= 2 * math.pi
-    while diff < -math.pi:
-        diff += 2 * math.pi
+    # Wrap to [-pi, pi]; in-range values (including +/-pi) are left untouched
+    if abs(diff) > math.pi:
+        diff = (diff + math.pi) % (2 * math.pi) - math.pi
 
     theta = thetaA + t * diff
 
@@ -236,42 +291,70 @@ def interpolate_poles(poleA: dict, poleB: dict, t: float) -> dict:
 
 def generate_zmf1_entry(model_id: int, model_data: dict, num_frames: int = 11) -> bytes:
     """Generate a ZMF1 binary entry for a Z-plane model."""
-    # ZMF1 Header (16 bytes)
-    header = bytearray()
-    header += b'ZMF1'                          # Magic (4 bytes)
-    header += struct.pack('<H', 1)             # Version (2 bytes)
-    header += struct.pack('<H', model_id)      # Model ID (2 bytes)
-    header += struct.pack('B', num_frames)     # Number of frames (1 byte)
-    header += struct.pack('B', 6)              # Number of sections (1 byte)
-    header += struct.pack('<I', 48000)         # Sample rate reference (4 bytes)
-    header += b'\x00\x00'                      # Reserved (2 bytes)
-
-    # Generate coefficient frames
-    frames = bytearray()
-    frameA_poles = model_data['frameA']['poles']
-    frameB_poles = model_data['frameB']['poles']
+    # ZMF1 Header (16 bytes): magic, version, model id, frames, sections, ref rate, reserved
+    header = _ZMF1_HDR.pack(b'ZMF1', 1, model_id, num_frames, 6, 48000, 0)
+
+    # Freeze the pole lists so the coefficient frames can be cached per model
+    frameA = tuple((p['r'], p['theta']) for p in model_data['frameA']['poles'][:6])
+    frameB = tuple((p['r'], p['theta']) for p in model_data['frameB']['poles'][:6])
+    frames = _build_frames(frameA, frameB, num_frames)
+
+    return header + frames
+
+@functools.lru_cache(maxsize=None)
+def _build_frames(frameA: tuple, frameB: tuple, num_frames: int) -> bytes:
+    """Coefficient frames for a model, keyed by its (r, theta) pole pairs."""
+    if np is not None:
+        return _build_frames_np(frameA, frameB, num_frames)
+
+    # Size is fully known: frames x 6 sections x 5 floats
+    frames = bytearray(num_frames * 6 * _SECTION.size)
 
     for frame_idx in range(num_frames):
         t = frame_idx / (num_frames - 1) if num_frames > 1 else 0.0
 
         # Interpolate and generate coefficients for each section
         for section_idx in range(6):
-            poleA = frameA_poles[section_idx]
-            poleB = frameB_poles[section_idx]
-            pole_interp = interpolate_poles(poleA, poleB, t)
+            rA, thetaA = frameA[section_idx]
+            rB, thetaB = frameB[section_idx]
+            pole_interp = interpolate_poles({'r': rA, 'theta': thetaA},
+                                            {'r': rB, 'theta': thetaB}, t)
 
             b0, b1, b2, a1, a2 = poles_to_biquad_coeffs(pole_interp['r'], pole_interp['theta'])
 
             # Pack as 5 floats (20 bytes per section)
-            frames += struct.pack('<fffff', b0, b1, b2, a1, a2)
+            _SECTION.pack_into(frames, (frame_idx * 6 + section_idx) * _SECTION.size,
+                               b0, b1, b2, a1, a2)
+
+    return bytes(frames)
+
+def _build_frames_np(frameA: tuple, frameB: tuple, num_frames: int) -> bytes:
+    """All frames x sections at once; same math as the scalar path."""
+    rA, thetaA = np.array(frameA[:6]).T
+    rB, thetaB = np.array(frameB[:6]).T
+    t = (np.arange(num_frames) / (num_frames - 1) if num_frames > 1
+         else np.zeros(1))[:, None]
+
+    # Shortest-path angle difference, wrapped to [-pi, pi]
+    diff = thetaB - thetaA
+    out_of_range = np.abs(diff) > math.pi
+    diff[out_of_range] = np.mod(diff[out_of_range] + math.pi, 2 * math.pi) - math.pi
+
+    # Interpolate, then pole pair -> EMU bandpass biquad (see poles_to_biquad_coeffs)
+    r = rA + t * (rB - rA)
+    theta = thetaA + t * diff
+    a1 = np.clip(-2.0 * r * np.cos(theta), -1.999, 1.999)
+    a2 = np.clip(r * r, -0.999, 0.999)
+    b0 = (1.0 - r) * 0.5
 
-    return bytes(header + frames)
+    coeffs = np.stack([b0, np.zeros_like(b0), -b0, a1, a2], axis=-1)
+    return coeffs.astype('<f4').tobytes()
 
-def augment_with_zmf1(entries: list[dict]) -> list[dict]:
+def augment_with_zmf1(entries: list[dict], next_id: int) -> tuple[list[dict], int]:
     """Add ZMF1 entries for any 0x22 messages if models are available."""
     models = load_zplane_models()
     if not models:
-        return entries
+        return entries, next_id
 
     # Map model names to IDs
     model_map = {
@@ -281,12 +364,11 @@ def augment_with_zmf1(entries: list[dict]) -> list[dict]:
     }
 
     augmented = list(entries)
-    next_id = max([e.get('id', 0) for e in entries] + [0]) + 1
 
     for entry in entries:
         if entry.get('type') == 0x10 and entry.get('meta', {}).get('sub') == 0x22:
             # Parse the 0x22 data to determine which model to use
-            data = entry.get('data', [])
+            data = entry.get('data', b'')
             if len(data) >= 14:
                 # Simple heuristic: use first byte modulo 3 to select model
                 # In production, you'd parse the actual EMU parameters
@@ -307,34 +389,32 @@ def augment_with_zmf1(entries: list[dict]) -> list[dict]:
                             'model': model_name,
                             'source_id': entry.get('id')
                         },
-                        'data': list(zmf1_data)
+                        'data': zmf1_data
                     })
                     next_id += 1
 
-    return augmented
+    return augmented, next_id
 
-def segment_assembled(entries: list[dict]) -> list[dict]:
+def segment_assembled(entries: list[dict], next_id: int) -> tuple[list[dict], int]:
     # Heuristic: if header present (type 0x10 sub 0x01) and assembled present (type 0x10 sub 0xFE),
     # carve tail as [LayFilt * 14][LayEnv * 92] from end of assembled blob and emit 0x22 entries.
     header = next((e for e in entries if int(e.get('type', 0)) == 0x10 and (e.get('meta') or {}).get('sub') == 0x01), None)
     assembled = next((e for e in entries if int(e.get('type', 0)) == 0x10 and (e.get('meta') or {}).get('sub') == 0xFE), None)
     if not header or not assembled:
-        return entries
-    hdr_data = bytes(header.get('data', []))
-    asm_data = bytes(assembled.get('data', []))
-    hdr = _parse_preset_header_blob(hdr_data)
+        return entries, next_id
+    hdr = _parse_preset_header_blob(header.get('data', b''))
     if not hdr:
-        return entries
+        return entries, next_id
     lay_filt = int(hdr['counts'].get('LayFilt', 0))
     lay_env = int(hdr['counts'].get('LayEnv', 0))
     need = lay_filt * 14 + lay_env * 92
-    if need == 0 or need > len(asm_data):
-        return entries
-    # Take from tail: [filters][envs]
-    tail = asm_data[-need:]
+    asm_mv = memoryview(assembled.get('data', b''))
+    if need == 0 or need > len(asm_mv):
+        return entries, next_id
+    # Take from tail: [filters][envs]; views only, each filter is copied once below
+    tail = asm_mv[-need:]
     filt_blob = tail[: lay_filt * 14]
     # env_blob = tail[lay_filt * 14 : ]  # currently unused
-    next_id = max([e.get('id', 0) for e in entries] + [0]) + 1
     for i in range(lay_filt):
         chunk = filt_blob[i*14:(i+1)*14]
         entries.append({
@@ -342,26 +422,31 @@ def segment_assembled(entries: list[dict]) -> list[dict]:
             'type': 0x10,
             'flags': 0,
             'meta': {'sub': 0x22, 'heuristic': True, 'idx': i},
-            'data': list(chunk)
+            'data': bytes(chunk)
         })
         next_id += 1
-    return entries
+    return entries, next_id
 
 def write_sidecar_json(sidecar_path: Path, entries: list[dict]) -> None:
-    import json as _json
-    out = []
-    for e in entries:
-        rec = {
-            'id': int(e.get('id', 0)),
-            'type': int(e.get('type', 0)),
-            'sub': int((e.get('meta') or {}).get('sub') or 0),
-            'flags': int(e.get('flags', 0)),
-            'length': len(e.get('data', [])),
-        }
-        if rec['type'] == 0x10 and rec['sub'] == 0x22 and rec['length'] == 14:
-            rec['bytes'] = list(e.get('data', []))
-        out.append(rec)
-    sidecar_path.write_text(_json.dumps({'count': len(out), 'entries': out}, indent=2))
+    """Stream the sidecar one record at a time; same text as dumps_json on the whole dict."""
+    with sidecar_path.open('wb') as f:
+        f.write(b'{\n  "count": %d,\n  "entries": [' % len(entries))
+        sep = b'\n    '
+        for e in entries:
+            rec = {
+                'id': int(e.get('id', 0)),
+                'type': int(e.get('type', 0)),
+                'sub': int((e.get('meta') or {}).get('sub') or 0),
+                'flags': int(e.get('flags', 0)),
+                'length': len(e.get('data', b'')),
+            }
+            if rec['type'] == 0x10 and rec['sub'] == 0x22 and rec['length'] == 14:
+                rec['bytes'] = list(e.get('data', b''))
+            # Records sit two levels deep, so re-indent their lines by 4
+            f.write(sep)
+            f.write(dumps_json(rec).replace(b'\n', b'\n    '))
+            sep = b',\n    '
+        f.write(b'\n  ]\n}' if entries else b']\n}')
 
 def pack(entries: list[dict]) -> bytes:
     """
@@ -370,24 +455,44 @@ def pack(entries: list[dict]) -> bytes:
       table[count]: id(u32) type(u16) sub(u16) flags(u16) offset(u32) length(u32)
       blobs: concatenated data
     """
-    header = bytearray()
-    header += MAGIC
-    header += struct.pack('<H', 1)  # version
-    header += struct.pack('<H', len(entries))
-    # Build table
-    table = bytearray()
-    blobs = bytearray()
-    entry_size = 4 + 2 + 2 + 2 + 4 + 4
-    offset = 4 + 2 + 2 + len(entries) * entry_size
-    for e in entries:
-        data = bytes(e.get('data', b''))
+    blobs = [e.get('data', b'') for e in entries]
+    table_off = _HDR.size
+    blob_off = _HDR.size + len(entries) * _ENTRY.size
+    # Everything is written in place into one buffer of the final size
+    buf = bytearray(blob_off + sum(len(d) for d in blobs))
+    _HDR.pack_into(buf, 0, MAGIC, 1, len(entries))  # version 1
+    for e, data in zip(entries, blobs):
         etype = int(e.get('type', 0))
         sub = int((e.get('meta', {}) or {}).get('sub', 0))
         flags = int(e.get('flags', 0))
-        table += struct.pack('<IHHHII', int(e.get('id', 0)), etype, sub, flags, offset, len(data))
-        blobs += data
-        offset += len(data)
-    return bytes(header + table + blobs)
+        _ENTRY.pack_into(buf, table_off, int(e.get('id', 0)), etype, sub, flags, blob_off, len(data))
+        buf[blob_off:blob_off + len(data)] = data
+        table_off += _ENTRY.size
+        blob_off += len(data)
+    return bytes(buf)
+
+def convert(raw: bytes, spec: ProteusSpec | None) -> tuple[list[dict], bytes]:
+    """Run the full SysEx -> entries -> ZPK1 pipeline on one dump."""
+    frames = extract_frames(raw)
+    entries, next_id = canonize(frames, spec)
+    # Assemble preset data blobs for easier downstream parsing
+    entries, next_id = assemble_preset(entries, next_id)
+    entries, next_id = segment_assembled(entries, next_id)
+    entries, _ = augment_with_zmf1(entries, next_id)
+    return entries, pack(entries)
+
+def _process_one(p: Path, out_dir: Path, spec: ProteusSpec | None):
+    """Pack one input file; runs in a worker process for --in-dir."""
+    entries, packed = convert(read_syx(p), spec)
+    out_path = out_dir / (p.stem + '.bin')
+    out_path.write_bytes(packed)
+    # Sidecar JSON summary next to pack
+    warning = None
+    try:
+        write_sidecar_json(out_path.with_suffix('.json'), entries)
+    except Exception as ex:
+        warning = f"[warn] failed sidecar for {out_path}: {ex}"
+    return p, out_path, len(packed), warning
 
 def main():
     ap = argparse.ArgumentParser()
@@ -397,35 +502,24 @@ def main():
     ap.add_argument('--out-dir', type=Path)
     ap.add_argument('--glob', type=str, default='**/*.syx')
     ap.add_argument('--spec', type=Path)
+    ap.add_argument('--jobs', type=int, help='worker processes for --in-dir (default: CPU count)')
     args = ap.parse_args()
 
     spec = None
     if args.spec:
-        spec = json.loads(args.spec.read_text())
+        spec = _normalize_spec(json.loads(args.spec.read_text()))
 
     if args.in_dir:
         in_dir = args.in_dir
         out_dir = args.out_dir or Path('plugins/_packs')
         out_dir.mkdir(parents=True, exist_ok=True)
         count = 0
-        for p in sorted(in_dir.rglob(args.glob)):
-            if p.is_file():
-                raw = read_syx(p)
-                frames = extract_frames(raw)
-                entries = canonize(frames, spec)
-                # Assemble preset data blobs for easier downstream parsing
-                entries = assemble_preset(entries)
-                entries = segment_assembled(entries)
-                entries = augment_with_zmf1(entries)
-                packed = pack(entries)
-                out_path = out_dir / (p.stem + '.bin')
-                out_path.write_bytes(packed)
-                # Sidecar JSON summary next to pack
-                try:
-                    write_sidecar_json(out_path.with_suffix('.json'), entries)
-                except Exception as ex:
-                    print(f"[warn] failed sidecar for {out_path}: {ex}")
-                print(f"Packed {p} -> {out_path} ({len(packed)} bytes)")
+        work = functools.partial(_process_one, out_dir=out_dir, spec=spec)
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            for p, out_path, size, warning in ex.map(work, walk_files(in_dir, args.glob), chunksize=8):
+                if warning:
+                    print(warning)
+                print(f"Packed {p} -> {out_path} ({size} bytes)")
                 count += 1
         print(f"Done. {count} file(s) processed to {out_dir}")
         return 0
@@ -434,13 +528,7 @@ def main():
         print('Specify input/out or use --in-dir/--out-dir', file=sys.stderr)
         return 2
 
-    raw = read_syx(args.input)
-    frames = extract_frames(raw)
-    entries = canonize(frames, spec)
-    entries = assemble_preset(entries)
-    entries = segment_assembled(entries)
-    entries = augment_with_zmf1(entries)
-    out = pack(entries)
+    entries, out = convert(read_syx(args.input), spec)
     args.out.parent.mkdir(parents=True, exist_ok=True)
     args.out.write_bytes(out)
     try:
@@ -15,14 +15,13 @@ Usage:
 import json
 import struct
 import math
-import cmath
 import numpy as np
 from pathlib import Path
 import sys
 
 # Import functions from sysex_pack.py
 sys.path.append(str(Path(__file__).parent))
-from sysex_pack import poles_to_biquad_coeffs, interpolate_poles, generate_zmf1_entry
+from sysex_pack import generate_zmf1_entry
 
 def load_models():
     """Load Z-plane models from shared models.json"""
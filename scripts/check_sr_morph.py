@@ -6,48 +6,177 @@ Usage:
 
 Each file should be a mono WAV render of the same preset/morph lane.
 The script prints median/95th percentile spectral deltas in dB.
+With --bands N, each render is reduced to N log-spaced bands (20 Hz-20 kHz)
+from a single FFT instead of a Welch spectrum; quicker, and a coarser metric.
 """
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import numpy as np
+import scipy.fft
 import soundfile as sf
-from scipy.signal import welch
+from scipy.io import wavfile
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import get_window
 
 EPS = 1e-12
+NPERSEG = 8192
+NOVERLAP = 4096
+SEGMENT_BATCH = 256
+BAND_LO_HZ = 20.0
+BAND_HI_HZ = 20000.0
+
+
+def averaged_spectrum(audio: np.ndarray, sr: float, nperseg: int = NPERSEG, noverlap: int = NOVERLAP):
+    """Welch power spectrum (Hann, constant detrend, "spectrum" scaling).
+
+    Equivalent to scipy.signal.welch(..., scaling="spectrum", nfft=nfft), but all
+    segments go through one batched rfft instead of welch's generic helper.
+    Segments are zero-padded to a fast FFT size; 8192 already is one, so
+    only renders shorter than a segment get padded.
+    """
+    nperseg = min(nperseg, len(audio))
+    step = nperseg - noverlap
+    if step <= 0:
+        raise ValueError("noverlap must be less than nperseg.")
+    nfft = scipy.fft.next_fast_len(nperseg, real=True)
+    win = get_window("hann", nperseg)
+    scale = (win / win.sum()).astype(audio.dtype)
+    segments = sliding_window_view(audio, nperseg)[::step]
+    # Transform in fixed-size batches so scratch memory does not grow with file length
+    psd = np.zeros(nfft // 2 + 1)
+    for start in range(0, len(segments), SEGMENT_BATCH):
+        batch = segments[start:start + SEGMENT_BATCH]
+        batch = batch - batch.mean(axis=-1, keepdims=True)
+        spec = scipy.fft.rfft(batch * scale, n=nfft, axis=-1, workers=-1)
+        psd += (spec.real**2 + spec.imag**2).sum(axis=0)
+    psd /= len(segments)
+    # One-sided: fold negative frequencies in, except DC (and Nyquist for even sizes)
+    psd[1:-1 if nfft % 2 == 0 else None] *= 2.0
+    return scipy.fft.rfftfreq(nfft, 1.0 / sr), psd
+
+
+def band_spectrum(audio: np.ndarray, sr: float, n_bands: int):
+    """Mean power in n_bands log-spaced bands from one full-length rfft.
+
+    Band edges are fixed in Hz, so every sample rate lands on the same grid;
+    bands above a file's Nyquist (or holding no bins) come back as NaN.
+    """
+    nfft = scipy.fft.next_fast_len(len(audio), real=True)
+    spec = scipy.fft.rfft(audio * get_window("hann", len(audio)).astype(audio.dtype), n=nfft, workers=-1)
+    power = spec.real.astype(np.float64)**2 + spec.imag.astype(np.float64)**2
+    edges = np.geomspace(BAND_LO_HZ, BAND_HI_HZ, n_bands + 1)
+    bins = np.searchsorted(scipy.fft.rfftfreq(nfft, 1.0 / sr), edges)
+    counts = np.diff(bins)
+    # A trailing zero keeps every edge a valid reduceat index, even past Nyquist
+    sums = np.add.reduceat(np.append(power, 0.0), bins)[:-1]
+    bands = np.full(n_bands, np.nan)
+    bands[counts > 0] = sums[counts > 0] / counts[counts > 0]
+    return np.sqrt(edges[:-1] * edges[1:]), bands
+
+
+# Full-scale divisors soundfile applies when decoding PCM to float
+_PCM_SCALE = {np.dtype(np.int16): 32768.0, np.dtype(np.int32): 2147483648.0}
+
 
+def read_channel0(path: str):
+    """First channel as float32 (plenty for dB-level deltas).
 
-def load_spectrum(path: str):
-    audio, sr = sf.read(path, always_2d=True)
-    if audio.shape[1] > 1:
-        audio = audio[:, 0]
-    audio = audio.astype(np.float64)
-    freqs, psd = welch(audio, sr, nperseg=8192, noverlap=4096, scaling="spectrum")
+    Plain PCM/float WAVs are memory-mapped, so only channel 0 is ever copied;
+    anything wavfile cannot map (24-bit, 8-bit, non-WAV) is decoded by soundfile.
+    """
+    try:
+        sr, data = wavfile.read(path, mmap=True)
+    except ValueError:
+        data = None
+    if data is not None and (data.dtype in _PCM_SCALE or data.dtype.kind == "f"):
+        mono = data if data.ndim == 1 else data[:, 0]
+        audio = mono.astype(np.float32)
+        if data.dtype in _PCM_SCALE:
+            audio *= np.float32(1.0 / _PCM_SCALE[data.dtype])
+        return sr, audio
+    with sf.SoundFile(path) as f:
+        sr = f.samplerate
+        audio = f.read(dtype="float32", always_2d=True)
+    return sr, np.ascontiguousarray(audio[:, 0])
+
+
+def load_spectrum(path: str, bands: int = 0):
+    sr, audio = read_channel0(path)
+    if bands:
+        freqs, psd = band_spectrum(audio, sr, bands)
+    else:
+        freqs, psd = averaged_spectrum(audio, sr)
     mag = 10.0 * np.log10(psd + EPS)
-    mag -= np.mean(mag)
+    mag -= np.nanmean(mag)
     return sr, freqs, mag
 
 
-def interpolate_magnitude(src_freqs, src_mag, dst_freqs):
-    return np.interp(dst_freqs, src_freqs, src_mag, left=src_mag[0], right=src_mag[-1])
+def resample_weights(src_freqs, dst_freqs):
+    """(idx, w) such that mag[idx]*(1-w) + mag[idx+1]*w linearly interpolates
+    src onto dst, holding the edge values outside src (as np.interp does)."""
+    idx = np.clip(np.searchsorted(src_freqs, dst_freqs, side="right") - 1, 0, len(src_freqs) - 2)
+    w = (dst_freqs - src_freqs[idx]) / (src_freqs[idx + 1] - src_freqs[idx])
+    return idx, np.clip(w, 0.0, 1.0)
 
 
-def compare(reference_path: str, compare_paths: list[str]):
-    ref_sr, ref_freqs, ref_mag = load_spectrum(reference_path)
-    print(f"Reference: {reference_path} ({ref_sr} Hz)")
-    for path in compare_paths:
-        sr, freqs, mag = load_spectrum(path)
-        interp = interpolate_magnitude(freqs, mag, ref_freqs)
+# ((src rate, bin count), (ref rate, bin count)) -> resample_weights; a rate and bin
+# count fix a grid, so renders at the same rate against the same reference share one
+_WEIGHTS = {}
+
+
+def interpolate_magnitude(src_freqs, src_mag, dst_freqs, key=None):
+    if len(src_freqs) < 2:
+        return np.interp(dst_freqs, src_freqs, src_mag, left=src_mag[0], right=src_mag[-1])
+    weights = _WEIGHTS.get(key) if key is not None else None
+    if weights is None:
+        weights = resample_weights(src_freqs, dst_freqs)
+        if key is not None:
+            _WEIGHTS[key] = weights
+    idx, w = weights
+    lo = src_mag[idx]
+    return lo + (src_mag[idx + 1] - lo) * w
+
+
+def spectral_delta(path: str, ref_sr, ref_freqs, ref_mag, bands: int = 0):
+    """(median, 95th percentile) dB delta of one render against the reference"""
+    sr, freqs, mag = load_spectrum(path, bands)
+    if bands:
+        # Shared band grid: no interpolation; bands empty in either file are skipped
+        delta = np.abs(mag - ref_mag)
+        delta = delta[~np.isnan(delta)]
+    else:
+        # keyed on both grids: compare() may run again against another reference
+        key = ((sr, len(freqs)), (ref_sr, len(ref_freqs)))
+        interp = interpolate_magnitude(freqs, mag, ref_freqs, key=key)
         delta = np.abs(interp - ref_mag)
-        median = float(np.median(delta))
-        p95 = float(np.percentile(delta, 95.0))
-        print(f"  {path}: median={median:.2f} dB, 95th={p95:.2f} dB")
+    return float(np.median(delta)), float(np.percentile(delta, 95.0))
+
+
+def compare(reference_path: str, compare_paths: list[str], bands: int = 0, jobs: int | None = None):
+    ref_sr, ref_freqs, ref_mag = load_spectrum(reference_path, bands)
+    print(f"Reference: {reference_path} ({ref_sr} Hz)")
+    measure = partial(spectral_delta, ref_sr=ref_sr, ref_freqs=ref_freqs, ref_mag=ref_mag, bands=bands)
+    serial = len(compare_paths) == 1 or jobs == 1
+    # Renders are independent; results still print in argument order
+    # (the pool only starts workers once something is submitted)
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        results = map(measure, compare_paths) if serial else ex.map(measure, compare_paths)
+        for path, (median, p95) in zip(compare_paths, results):
+            print(f"  {path}: median={median:.2f} dB, 95th={p95:.2f} dB")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Compare morph spectra across sample rates.")
     parser.add_argument("--ref", required=True, help="reference WAV (e.g. 48k render)")
     parser.add_argument("--compare", nargs="+", required=True, help="comparison WAVs (44.1k, 96k, etc.)")
+    parser.add_argument("--bands", type=int, default=0,
+                        help="compare N log-spaced band powers from one FFT instead of Welch spectra")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for the comparison files (default: CPU count)")
     args = parser.parse_args()
-    compare(args.ref, args.compare)
+    compare(args.ref, args.compare, args.bands, args.jobs)
 
 
 if __name__ == "__main__":
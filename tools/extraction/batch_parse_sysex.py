@@ -3,20 +3,25 @@
 Batch EMU SysEx Parser - Process entire folders of SysEx files
 """
 
+import csv
+import os
 import sys
 import argparse
 import glob
+import itertools
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter
 
 # Add project root to path
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from tools.extraction.parse_emu_sysex import parse_sysex_file, merge_names_with_headers
+from tools.extraction.parse_emu_sysex import ROW_FIELDS, parse_sysex_file_logged, merge_names_with_headers
 
-def batch_parse_sysex(input_path: Path, output_csv: Path, pattern: str = "*.syx"):
+def batch_parse_sysex(input_path: Path, output_csv: Path, pattern: str = "*.syx", jobs: int | None = None):
     """
     Batch parse SysEx files from a directory or file pattern.
     
@@ -24,6 +29,7 @@ def batch_parse_sysex(input_path: Path, output_csv: Path, pattern: str = "*.syx"
         input_path: Directory or file pattern to process
         output_csv: Output CSV file path
         pattern: File pattern to match (default: *.syx)
+        jobs: Worker processes (default: CPU count)
     """
     
     # Find all matching files
@@ -41,22 +47,28 @@ def batch_parse_sysex(input_path: Path, output_csv: Path, pattern: str = "*.syx"
     
     print(f"Found {len(files)} SysEx files to process...")
     
-    all_rows = []
+    per_file = []
     processed_count = 0
     error_count = 0
     
-    for file_path in files:
-        try:
-            rows = parse_sysex_file(file_path)
-            all_rows.extend(rows)
+    serial = len(files) == 1 or jobs == 1
+    # Files parse independently; results come back in input order
+    # (the pool only starts workers once something is submitted)
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as ex:
+        results = map(parse_sysex_file_logged, files) if serial else ex.map(parse_sysex_file_logged, files, chunksize=32)
+        for file_path, (rows, log, error) in zip(files, results):
+            sys.stdout.write(log)
+            if error is not None:
+                print(f"[ERROR] {file_path.name}: {error}")
+                error_count += 1
+                continue
+            per_file.append(rows)
             processed_count += 1
             if rows:
                 print(f"[OK] {file_path.name}: {len(rows)} messages")
             else:
                 print(f"[SKIP] {file_path.name}: no valid messages")
-        except Exception as e:
-            print(f"[ERROR] {file_path.name}: {e}")
-            error_count += 1
+    all_rows = list(itertools.chain.from_iterable(per_file))
     
     if not all_rows:
         print("[ERROR] No valid SysEx messages found in any files")
@@ -66,28 +78,29 @@ def batch_parse_sysex(input_path: Path, output_csv: Path, pattern: str = "*.syx"
     merged_rows = merge_names_with_headers(all_rows)
     
     # Sort by ROM ID, then preset number, then layer
-    merged_rows.sort(key=lambda x: (x["rom_id"], x["preset_num"], x["layer_index"]))
+    merged_rows.sort(key=itemgetter(2, 1, 4))
     
     # Write CSV
-    fieldnames = ["filename", "preset_num", "rom_id", "preset_name", "layer_index", "filter_type_id", "message_type"]
     with output_csv.open("w", newline="") as f:
-        import csv
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
+        w = csv.writer(f)
+        w.writerow(ROW_FIELDS)
         w.writerows(merged_rows)
     
     # Generate summary
     print(f"\n[SUCCESS] Processed {processed_count} files, {error_count} errors")
     print(f"Extracted {len(merged_rows)} total messages → {output_csv}")
     
-    # ROM ID summary
-    rom_counts = defaultdict(int)
-    filter_type_counts = defaultdict(int)
-    
-    for row in merged_rows:
-        rom_counts[row["rom_id"]] += 1
-        if row["filter_type_id"] != -1:
-            filter_type_counts[row["filter_type_id"]] += 1
+    # One counting pass over the rows; the per-field summaries then only walk
+    # the (few) distinct combinations
+    combos = Counter(map(itemgetter(2, 5, 6), merged_rows))  # rom_id, filter_type_id, message_type
+    rom_counts = Counter()
+    filter_type_counts = Counter()
+    msg_type_counts = Counter()
+    for (rom_id, filter_id, msg_type), count in combos.items():
+        rom_counts[rom_id] += count
+        if filter_id != -1:
+            filter_type_counts[filter_id] += count
+        msg_type_counts[msg_type] += count
     
     print("\nROM ID Summary:")
     for rom_id, count in sorted(rom_counts.items()):
@@ -98,11 +111,6 @@ def batch_parse_sysex(input_path: Path, output_csv: Path, pattern: str = "*.syx"
         for filter_id, count in sorted(filter_type_counts.items()):
             print(f"  Filter Type {filter_id}: {count} occurrences")
     
-    # Message type summary
-    msg_type_counts = defaultdict(int)
-    for row in merged_rows:
-        msg_type_counts[row["message_type"]] += 1
-    
     print("\nMessage Type Summary:")
     for msg_type, count in sorted(msg_type_counts.items()):
         print(f"  {msg_type}: {count} messages")
@@ -132,10 +140,12 @@ Examples:
                        help="Output CSV file path")
     parser.add_argument("--pattern", default="*.syx",
                        help="File pattern to match (default: *.syx)")
+    parser.add_argument("--jobs", type=int, default=None,
+                       help="Worker processes (default: CPU count)")
     
     args = parser.parse_args()
     
-    success = batch_parse_sysex(args.input_path, args.output_csv, args.pattern)
+    success = batch_parse_sysex(args.input_path, args.output_csv, args.pattern, args.jobs)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
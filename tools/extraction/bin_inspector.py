@@ -6,87 +6,82 @@
 
 import sys, os, argparse
 import numpy as np
+from table_scan import window_std_ok, tail_stats
 
 def find_ascii_strings(data, minlen=6):
-    out, cur = [], []
-    for b in data:
-        if 32 <= b < 127:
-            cur.append(chr(b))
-        else:
-            if len(cur) >= minlen:
-                out.append(''.join(cur))
-            cur = []
-    if len(cur) >= minlen:
-        out.append(''.join(cur))
-    return out
+    arr = np.frombuffer(data, dtype=np.uint8)
+    printable = ((arr >= 32) & (arr < 127)).view(np.int8)
+    # +1 where a printable run starts, -1 one past where it ends
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], printable, [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    keep = (ends - starts) >= minlen
+    # slice before converting, so a mapped file is never copied whole
+    return [arr[s:e].tobytes().decode('ascii') for s, e in zip(starts[keep].tolist(), ends[keep].tolist())]
 
 def export_csv(arr, path):
     np.savetxt(path, arr, fmt='%.9g', delimiter=',')
 
+def _good_runs(good, min_len):
+    """(start, end) of each run of True in good that is at least min_len long"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], good.view(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    keep = (ends - starts) >= min_len
+    return zip(starts[keep].tolist(), ends[keep].tolist())
+
 def scan_float32_tables(data_bytes, min_len=64, outdir='results', basename='file'):
     floats_le = np.frombuffer(data_bytes, dtype='<f4')  # little-endian float32
     N = floats_le.size
     candidates = []
-    i = 0
-    while i < N - min_len:
-        chunk = floats_le[i:i+min_len]
-        if not np.all(np.isfinite(chunk)):
-            i += 1
+    # A start offset i qualifies when its min_len window is finite and < 1e6 in magnitude;
+    # the table then extends to the end of that run of sane values.
+    with np.errstate(invalid='ignore', over='ignore'):
+        good = np.isfinite(floats_le) & (np.abs(floats_le) < 1e6)
+    for s, e in _good_runs(good, min_len):
+        last = min(e - min_len, N - min_len - 1)  # starts are limited to i < N - min_len
+        if last < s:
+            continue
+        run = floats_le[s:e]
+        # heuristic: monotonic or sinusoidal or envelope-like, evaluated for every
+        # suffix run[k:] at once (k = i - s)
+        length, frac_pos, zc, ptp = tail_stats(run, last - s + 1)
+        shaped = (frac_pos > 0.85) | (frac_pos < 0.15) | (zc >= 3) | ((ptp > 1e-3) & (length <= 4096))
+        hits = np.flatnonzero(shaped & window_std_ok(run[:last - s + min_len], min_len, 1e-6))
+        if hits.size == 0:
             continue
-        mx = float(np.max(np.abs(chunk)))
-        std = float(np.std(chunk))
-        if mx < 1e6 and std > 1e-6:
-            # expand forward while finite
-            j = i + min_len
-            while j < N and np.isfinite(floats_le[j]) and abs(float(floats_le[j])) < 1e6:
-                j += 1
-            length = j - i
-            if length >= min_len:
-                arr = floats_le[i:j]
-                # heuristic: monotonic or sinusoidal or envelope-like
-                diffs = np.diff(arr)
-                frac_pos = np.mean(diffs > 0)
-                zc = np.sum(np.abs(np.diff(np.sign(arr))))/2
-                if frac_pos > 0.85 or frac_pos < 0.15 or zc >= 3 or (np.ptp(arr) > 1e-3 and length <= 4096):
-                    idx = len(candidates)
-                    path = os.path.join(outdir, f'{basename}_float_table_{idx:03d}.csv')
-                    if not os.path.exists(outdir): os.makedirs(outdir)
-                    export_csv(arr, path)
-                    candidates.append((i, j, path))
-                    i = j
-                    continue
-        i += 1
+        i, j = s + int(hits[0]), e
+        arr = floats_le[i:j]
+        idx = len(candidates)
+        path = os.path.join(outdir, f'{basename}_float_table_{idx:03d}.csv')
+        if not os.path.exists(outdir): os.makedirs(outdir)
+        export_csv(arr, path)
+        candidates.append((i, j, path))
     return candidates
 
 def scan_int16_audio_like(data_bytes, min_samples=48000, outdir='results', basename='file'):
-    int16 = np.frombuffer(data_bytes, dtype='<i2').astype(np.int32)
+    int16 = np.frombuffer(data_bytes, dtype='<i2')
     N = int16.size
     candidates = []
     if N < min_samples:
         return candidates
-    # sliding RMS
+    # sliding RMS: box filter from an exact int64 running sum of squares, O(N) for any window
     win = 4096
-    rms = np.sqrt(np.convolve(int16.astype(np.float64)**2, np.ones(win)/win, mode='valid'))
+    sq = np.square(int16, dtype=np.int64)
+    c = np.concatenate(([0], np.cumsum(sq, out=sq)))
+    rms = np.sqrt((c[win:] - c[:-win]) / win)
     thresh = max(np.mean(rms) * 2.0, 1.0)
     above = rms > thresh
-    i = 0; L = above.size
-    while i < L:
-        if above[i]:
-            j = i
-            while j < L and above[j]:
-                j += 1
-            s = max(0, i)
-            e = min(N, j + win)
-            if (e - s) >= min_samples:
-                candid = (s, e)
-                candidates.append(candid)
-                # export raw int16
-                if not os.path.exists(outdir): os.makedirs(outdir)
-                rawpath = os.path.join(outdir, f'{basename}_pcm_int16_{len(candidates)-1:03d}.raw')
-                int16[s:e].astype('<i2').tofile(rawpath)
-            i = j
-        else:
-            i += 1
+    # each run of windows above threshold covers samples from its first window start
+    # to the end of its last window
+    for i, j in _good_runs(above, 1):
+        s = max(0, i)
+        e = min(N, j + win)
+        if (e - s) >= min_samples:
+            candid = (s, e)
+            candidates.append(candid)
+            # export raw int16
+            if not os.path.exists(outdir): os.makedirs(outdir)
+            rawpath = os.path.join(outdir, f'{basename}_pcm_int16_{len(candidates)-1:03d}.raw')
+            int16[s:e].astype('<i2').tofile(rawpath)
     return candidates
 
 def main():
@@ -96,12 +91,11 @@ def main():
     p.add_argument('--outdir', default='results')
     args = p.parse_args()
     fname = args.file
-    with open(fname, 'rb') as f:
-        data = f.read()
-    data_b = bytearray(data)
-    print("File size:", len(data_b))
+    # Map the file once; every scanner views the same pages with its own dtype
+    data = np.memmap(fname, dtype=np.uint8, mode='r') if os.path.getsize(fname) else b''
+    print("File size:", len(data))
     print("Extracting ASCII strings (first 60):")
-    strings = find_ascii_strings(data_b, minlen=6)
+    strings = find_ascii_strings(data, minlen=6)
     for s in strings[:60]:
         print("  ", s)
     print("Scanning float32 arrays...")
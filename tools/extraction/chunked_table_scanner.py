@@ -7,8 +7,9 @@
 # Finds candidate lookup tables (float32 LE/BE, uint16 monotonic) in large binaries
 # without loading entire file in RAM. Exports CSV snippets around each candidate.
 
-import os, sys, argparse, math, mmap
+import os, sys, argparse, math
 import numpy as np
+from table_scan import window_std_ok, tail_stats
 
 def nice_size(n):
     for unit in ('B','KB','MB','GB','TB'):
@@ -21,28 +22,69 @@ def ensure_dir(p):
     if not os.path.exists(p):
         os.makedirs(p)
 
-def scan_chunk_for_float_tables(buf: memoryview, base_off: int, outdir: str,
-                                min_len=64, stride=1, endian='<', namehint='le'):
-    """Heuristic: run-lengths of finite float32 with sane magnitude; monotonic or wavy."""
-    arr = np.frombuffer(buf, dtype=(endian+'f4'))
+def count_existing_tables(outdir, hints=('f32le', 'f32be', 'u16')):
+    """Per-hint CSV counts already in outdir; export indices continue from these."""
+    names = [f for f in os.listdir(outdir) if f.endswith('.csv')] if os.path.isdir(outdir) else []
+    return {h: sum(h in f for f in names) for h in hints}
+
+def _all_in_windows(mask, min_len, stride=1):
+    """all(mask[i:i+min_len:stride]) for every window start i"""
+    if stride == 1:
+        c = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+        return (c[min_len:] - c[:-min_len]) == min_len
+    return np.lib.stride_tricks.sliding_window_view(mask, min_len)[:, ::stride].all(axis=1)
+
+def _first_table_start(run, ks, min_len):
+    """First k in ks whose tail run[k:] passes the table filters, or None.
+
+    The filter statistics of every tail come from suffix sums over run, rather
+    than from re-diffing run[k:] for each candidate k in turn.
+    """
+    n = int(ks[-1]) + 1
+    length, frac_pos, zc, ptp = tail_stats(run, n)
+    shaped = (frac_pos > 0.85) | (frac_pos < 0.15) | ((ptp > 1e-3) & (length <= 4096))
+    ok = window_std_ok(run[:n - 1 + min_len], min_len, 1e-9)
+    # Wavy tails also need std(run[k:]) > 1e-4; only those pay for a full std
+    for k in ks[ok[ks] & (shaped[ks] | (zc[ks] >= 4))].tolist():
+        if shaped[k] or np.std(run[k:]) > 1e-4:
+            return k
+    return None
+
+def _contiguous_float_tables(arr, sane, starts, min_len):
+    """(i, j) of each table for stride 1.
+
+    A start's window lies inside one sane run, and the table then extends to
+    that run's end; so each run holds at most one table, from its first start
+    that passes the filters.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], sane.view(np.int8), [0]))))
+    for s, e in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+        lo = int(np.searchsorted(starts, s))
+        hi = int(np.searchsorted(starts, e - min_len, side='right'))
+        if lo == hi:
+            continue
+        k = _first_table_start(arr[s:e], starts[lo:hi] - s, min_len)
+        if k is not None:
+            yield s + k, e
+
+def _strided_float_tables(arr, sane, starts, min_len, stride):
+    """(i, j) of each table, testing one start at a time"""
     N = arr.size
+    insane = np.flatnonzero(~sane)
     i = 0
-    found = 0
-    while i + min_len <= N:
+    while True:
+        k = int(np.searchsorted(starts, i))
+        if k == starts.size:
+            break
+        i = int(starts[k])
         # sample a small window
         win = arr[i:i+min_len:stride]
-        if not np.all(np.isfinite(win)):
-            i += 1; continue
         mx = float(np.max(np.abs(win)))
         std = float(np.std(win))
         if mx < 1e6 and std > 1e-9:
-            # try to extend forward while sane
-            j = i + min_len
-            while j < N:
-                v = arr[j]
-                if not np.isfinite(v) or abs(float(v)) >= 1e6:
-                    break
-                j += 1
+            # extend forward while sane: up to the next non-finite or huge value
+            k = int(np.searchsorted(insane, i + min_len))
+            j = int(insane[k]) if k < insane.size else N
             length = j - i
             if length >= min_len:
                 # heuristic filters
@@ -53,61 +95,105 @@ def scan_chunk_for_float_tables(buf: memoryview, base_off: int, outdir: str,
                 monotonicish = (frac_pos > 0.85 or frac_pos < 0.15)
                 sinusoidalish = (zc >= 4 and np.std(cand) > 1e-4)
                 if monotonicish or sinusoidalish or (np.ptp(cand) > 1e-3 and length <= 4096):
-                    # limit export size to keep artifacts small
-                    clip_len = min(length, 2048)
-                    out = cand[:clip_len]
-                    ensure_dir(outdir)
-                    idx = len([f for f in os.listdir(outdir) if f.endswith('.csv') and namehint in f])
-                    path = os.path.join(outdir, f"tables_{namehint}_{idx:03d}_off_{base_off + i*4}.csv")
-                    np.savetxt(path, out, delimiter=',', fmt='%.9g')
-                    found += 1
+                    yield i, j
                     i = j
                     continue
         i += 1
+
+def scan_chunk_for_float_tables(buf: np.ndarray, base_off: int, outdir: str,
+                                min_len=64, stride=1, endian='<', namehint='le', counters=None):
+    """Heuristic: run-lengths of finite float32 with sane magnitude; monotonic or wavy."""
+    arr = np.frombuffer(buf, dtype=(endian+'f4'))
+    N = arr.size
+    found = 0
+    if N < min_len:
+        return found
+    # One vectorized pass decides which offsets can start a table at all: the sampled
+    # window must be finite with |v| < 1e6, and not all zeros (std would be exactly 0).
+    sane = np.isfinite(arr) & (np.abs(arr) < 1e6)
+    starts = np.flatnonzero(_all_in_windows(sane, min_len, stride)
+                            & ~_all_in_windows(arr == 0, min_len, stride))
+    if starts.size == 0:
+        return found  # e.g. the byte-swapped view of a little-endian file
+    if stride == 1:
+        tables = _contiguous_float_tables(arr, sane, starts, min_len)
+    else:
+        # a sampled window can straddle insane values, so runs do not line up with starts
+        tables = _strided_float_tables(arr, sane, starts, min_len, stride)
+    for i, j in tables:
+        # limit export size to keep artifacts small
+        out = arr[i:min(j, i + 2048)]
+        ensure_dir(outdir)
+        if counters is None:
+            counters = count_existing_tables(outdir, (namehint,))
+        idx = counters[namehint]
+        counters[namehint] += 1
+        path = os.path.join(outdir, f"tables_{namehint}_{idx:03d}_off_{base_off + i*4}.csv")
+        np.savetxt(path, out, delimiter=',', fmt='%.9g')
+        found += 1
     return found
 
-def scan_chunk_for_u16_tables(buf: memoryview, base_off: int, outdir: str, min_len=64, stride=1, endian='<'):
+def scan_chunk_for_u16_tables(buf: np.ndarray, base_off: int, outdir: str, min_len=64, stride=1, endian='<',
+                              counters=None):
     arr = np.frombuffer(buf, dtype=(endian+'u2'))
     N = arr.size
-    i = 0
     found = 0
-    while i + min_len <= N:
-        win = arr[i:i+min_len:stride]
-        # monotonic nontrivial range
-        diffs = np.diff(win.astype(np.int64))
-        if (np.all(diffs >= 0) or np.all(diffs <= 0)) and (int(np.ptp(win)) > 8):
-            # extend
-            j = i + min_len
-            last = win[-1]
-            while j < N:
-                v = arr[j]
-                if (v < last and diffs[0] >= 0) or (v > last and diffs[0] <= 0):
-                    break
-                last = v
-                j += 1
-            length = j - i
-            if length >= min_len:
-                clip_len = min(length, 4096)
-                out = arr[i:i+clip_len].astype(np.float32)  # save as float for convenience
-                ensure_dir(outdir)
-                idx = len([f for f in os.listdir(outdir) if f.endswith('.csv') and 'u16' in f])
-                path = os.path.join(outdir, f"tables_u16_{idx:03d}_off_{base_off + i*2}.csv")
-                np.savetxt(path, out, delimiter=',', fmt='%.9g')
-                found += 1
-                i = j
-                continue
-        i += 1
+    m = len(range(0, min_len, stride))  # samples per window
+    if N < min_len or m < 2:
+        return found  # a single sample can never span more than 8
+    x = arr.astype(np.int64)
+    # Sampled steps: ds[i] = x[i+stride] - x[i]. A window starting at i is monotonic
+    # when its m-1 sampled steps share a sign; its range is then |last - first|.
+    ds = x[stride:] - x[:-stride]
+    span = (m - 2) * stride + 1
+    n_starts = N - min_len + 1
+    up = _all_in_windows(ds >= 0, span, stride)[:n_starts]
+    dn = _all_in_windows(ds <= 0, span, stride)[:n_starts]
+    first, last_sampled = x[:n_starts], x[(m - 1)*stride:(m - 1)*stride + n_starts]
+    starts = np.flatnonzero((up | dn) & (np.abs(last_sampled - first) > 8))
+    # Where a table stops when extended one element at a time: the first j whose
+    # value moves against the direction set by the first sampled step (any change if flat)
+    d = np.diff(x)
+    breaks = {1: np.flatnonzero(d < 0) + 1, -1: np.flatnonzero(d > 0) + 1, 0: np.flatnonzero(d != 0) + 1}
+    i = 0
+    while True:
+        k = int(np.searchsorted(starts, i))
+        if k == starts.size:
+            break
+        i = int(starts[k])
+        direction = int(np.sign(ds[i]))
+        last = int(x[i + (m - 1)*stride])
+        # extend: the first value is checked against the last sampled one, the rest pairwise
+        j = i + min_len
+        if j < N:
+            v = int(x[j])
+            if not ((v < last and direction >= 0) or (v > last and direction <= 0)):
+                stops = breaks[direction]
+                k = int(np.searchsorted(stops, j + 1))
+                j = int(stops[k]) if k < stops.size else N
+        length = j - i
+        clip_len = min(length, 4096)
+        out = arr[i:i+clip_len].astype(np.float32)  # save as float for convenience
+        ensure_dir(outdir)
+        if counters is None:
+            counters = count_existing_tables(outdir, ('u16',))
+        idx = counters['u16']
+        counters['u16'] += 1
+        path = os.path.join(outdir, f"tables_u16_{idx:03d}_off_{base_off + i*2}.csv")
+        np.savetxt(path, out, delimiter=',', fmt='%.9g')
+        found += 1
+        i = j
     return found
 
-def scan_chunk_for_pcm(buf: memoryview, base_off: int, outdir: str):
+def scan_chunk_for_pcm(buf: np.ndarray, base_off: int, outdir: str):
     # Lightweight int16 RMS-based detector; exports small raw slices index only (no WAV)
     arr = np.frombuffer(buf, dtype='<i2')
     if arr.size < 8192: return 0
-    x = arr.astype(np.float32)
     win = 4096
-    # avoid heavy conv for huge chunks by downsampling envelope
+    # avoid a full-rate envelope for huge chunks by downsampling; 8-tap box RMS via running sum
     step = 512
-    rms = np.sqrt(np.convolve(x[::step]**2, np.ones(8)/8.0, mode='valid'))
+    c = np.concatenate(([0], np.cumsum(arr[::step].astype(np.int64)**2)))
+    rms = np.sqrt((c[8:] - c[:-8]) / 8.0)
     if rms.size == 0: return 0
     thr = max(rms.mean()*2.0, 100.0)
     hits = int(np.sum(rms > thr))
@@ -135,34 +221,38 @@ def main():
     print(f"File: {path}")
     print(f"Size: {size:,} bytes ({nice_size(size)})")
     ensure_dir(args.outdir)
+    # Running export indices, so each write does not re-list outdir
+    counters = count_existing_tables(args.outdir)
 
     chunk = args.chunk_mb * 1024 * 1024
     overlap = 4096  # keep small overlap so we don't split tables on boundaries
     scanned = 0
     tot_f = tot_fb = tot_u16 = tot_pcm = 0
 
-    with open(path, 'rb') as f, mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mm:
-        off = 0
-        while off < size:
-            end = min(size, off + chunk)
-            # include overlap from previous chunk
-            start = max(0, off - overlap if off else off)
-            view = memoryview(mm)[start:end]
-            print(f"  scanning {start:,}..{end:,} ({nice_size(end-start)})")
-
-            # floats LE/BE
-            tot_f  += scan_chunk_for_float_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='<', namehint='f32le')
-            tot_fb += scan_chunk_for_float_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='>', namehint='f32be')
-            # u16 monotonic (LE/BE)
-            tot_u16 += scan_chunk_for_u16_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='<')
-            tot_u16 += scan_chunk_for_u16_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='>')
-
-            # PCM marker (optional)
-            if not args.no_pcm:
-                tot_pcm += scan_chunk_for_pcm(view, start, args.outdir)
-
-            off = end
-            scanned += 1
+    # One read-only byte map for the whole file; chunks are plain ndarray slices of it
+    # that the OS pages in lazily, so there is no mapping or exported views to close
+    mm = np.memmap(path, dtype=np.uint8, mode='r')
+    off = 0
+    while off < size:
+        end = min(size, off + chunk)
+        # include overlap from previous chunk
+        start = max(0, off - overlap if off else off)
+        view = mm[start:end]
+        print(f"  scanning {start:,}..{end:,} ({nice_size(end-start)})")
+
+        # floats LE/BE
+        tot_f  += scan_chunk_for_float_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='<', namehint='f32le', counters=counters)
+        tot_fb += scan_chunk_for_float_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='>', namehint='f32be', counters=counters)
+        # u16 monotonic (LE/BE)
+        tot_u16 += scan_chunk_for_u16_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='<', counters=counters)
+        tot_u16 += scan_chunk_for_u16_tables(view, start, args.outdir, min_len=args.min_table, stride=args.stride, endian='>', counters=counters)
+
+        # PCM marker (optional)
+        if not args.no_pcm:
+            tot_pcm += scan_chunk_for_pcm(view, start, args.outdir)
+
+        off = end
+        scanned += 1
 
     print("\n=== summary ===")
     print("float32 LE tables:", tot_f)
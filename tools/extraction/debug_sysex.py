@@ -1,19 +1,26 @@
 #!/usr/bin/env python3
+import binascii
+import io
 import struct
 from pathlib import Path
 from syx_tools import split_and_unpack, analyze_sysex_file
 
+# Printable ASCII maps to itself, everything else to '.'
+_ASCII_TABLE = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
 def hex_dump(data, max_bytes=256):
     """Create a hex dump of binary data."""
-    lines = []
+    buf = io.StringIO()
+    sep = ''
     for i in range(0, min(len(data), max_bytes), 16):
-        chunk = data[i:i+16]
-        hex_part = ' '.join(f'{b:02x}' for b in chunk)
-        ascii_part = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-        lines.append(f'{i:04x}: {hex_part:<48} {ascii_part}')
+        chunk = bytes(data[i:i+16])
+        hex_part = binascii.hexlify(chunk, ' ').decode('ascii')
+        ascii_part = chunk.translate(_ASCII_TABLE).decode('ascii')
+        buf.write(f'{sep}{i:04x}: {hex_part:<48} {ascii_part}')
+        sep = '\n'
     if len(data) > max_bytes:
-        lines.append(f'... ({len(data)} total bytes)')
-    return '\n'.join(lines)
+        buf.write(f'{sep}... ({len(data)} total bytes)')
+    return buf.getvalue()
 
 def analyze_emu_structure(syx_path):
     """Deep analysis of EMU SysEx structure."""
@@ -39,29 +46,23 @@ def analyze_emu_structure(syx_path):
 
         # Look for repeating patterns (potential shape data)
         if len(msg) >= 24:  # At least 12 words
-            # Try different word sizes and endianness
-            for word_size, fmt in [(2, 'H'), (4, 'I')]:
-                for endian in ['<', '>']:
-                    try:
-                        words = struct.unpack(endian + fmt * (len(msg) // word_size),
-                                            msg[:len(msg) // word_size * word_size])
-
-                        # Look for potential radius values (0.7-0.999 as fixed point)
-                        if word_size == 2:  # 16-bit
-                            potential_radii = []
-                            for w in words[:24]:  # Check first 24 words
-                                for scale in [32767, 65535]:  # Q1.15, Q0.16
-                                    r = w / scale
-                                    if 0.7 <= r <= 0.999:
-                                        potential_radii.append((w, r, scale))
+            # Only the first 24 16-bit words are checked, so only those are unpacked
+            n_words = min(24, len(msg) // 2)
+            for endian in ['<', '>']:
+                words = struct.unpack_from(f'{endian}{n_words}H', msg)
 
-                            if len(potential_radii) >= 6:  # At least 6 radii (for 6 poles)
-                                print(f"  Potential radii found ({endian}{fmt}):")
-                                for w, r, scale in potential_radii[:6]:
-                                    print(f"    {w:5d} -> {r:.4f} (scale={scale})")
+                # Look for potential radius values (0.7-0.999 as fixed point)
+                potential_radii = []
+                for w in words:
+                    for scale in [32767, 65535]:  # Q1.15, Q0.16
+                        r = w / scale
+                        if 0.7 <= r <= 0.999:
+                            potential_radii.append((w, r, scale))
 
-                    except struct.error:
-                        continue
+                if len(potential_radii) >= 6:  # At least 6 radii (for 6 poles)
+                    print(f"  Potential radii found ({endian}H):")
+                    for w, r, scale in potential_radii[:6]:
+                        print(f"    {w:5d} -> {r:.4f} (scale={scale})")
 
 def main():
     # Test files from different categories
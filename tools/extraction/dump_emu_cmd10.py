@@ -9,7 +9,8 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from tools.extraction.syx_tools import split_sysex_file, is_emu_proteus, emu_fields
+from tools.extraction.syx_cache import load_messages
+from tools.extraction.syx_tools import EMU_ID, is_emu_proteus, emu_fields
 
 CMD_PRESET_DUMP = 0x10
 
@@ -22,18 +23,18 @@ SUB_NAMES = {
 }
 
 PRINTABLE = set(bytes(string.printable, 'ascii'))
+# Byte -> itself if printable (less VT/FF, which would break the line), else '.'
+_PREVIEW_TABLE = bytes(ch if ch in PRINTABLE and ch not in (0x0B, 0x0C) else 0x2E for ch in range(256))
 
 def ascii_preview(b: bytes, n: int = 80) -> str:
-    s = bytearray()
-    for ch in b[:n]:
-        s.append(ch if ch in PRINTABLE and ch not in (0x0B, 0x0C) else 0x2E)
-    return s.decode('ascii', errors='ignore')
+    return bytes(b[:n]).translate(_PREVIEW_TABLE).decode('ascii')
 
 def dump_cmd10(path: Path):
-    msgs = split_sysex_file(str(path))
+    msgs = load_messages(str(path))
     print(f"\n== {path} ==")
     for i, m in enumerate(msgs):
-        if not is_emu_proteus(m):
+        # Every message starts F0 and ends F7, so m[1] exists; most fail on the maker ID
+        if m[1] != EMU_ID or not is_emu_proteus(m):
             continue
         dev, cmd, sub, payload = emu_fields(m)
         if cmd != CMD_PRESET_DUMP:
@@ -8,7 +8,8 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from tools.extraction.syx_tools import split_sysex_file, is_emu_proteus, emu_fields
+from tools.extraction.syx_cache import load_messages
+from tools.extraction.syx_tools import EMU_ID, is_emu_proteus, emu_fields
 
 CMD_PRESET_DUMP = 0x10
 SUB_HDR_CLOSED  = 0x01
@@ -19,14 +20,15 @@ def u16(lsb: int, msb: int) -> int:
 
 def dump_headers(path: Path):
     try:
-        msgs = split_sysex_file(str(path))
+        msgs = load_messages(str(path))
     except Exception as e:
         print(f"[err] {path}: {e}")
         return
     print(f"\n== {path} ==")
     found = False
     for idx, m in enumerate(msgs):
-        if not is_emu_proteus(m):
+        # Every message starts F0 and ends F7, so m[1] exists; most fail on the maker ID
+        if m[1] != EMU_ID or not is_emu_proteus(m):
             continue
         dev, cmd, sub, payload = emu_fields(m)
         if cmd == CMD_PRESET_DUMP and sub in (SUB_HDR_CLOSED, SUB_HDR_OPEN):
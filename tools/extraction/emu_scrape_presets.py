@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import csv, argparse, re
-from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from syx_tools import split_sysex_file, is_emu_proteus, emu_fields, midi_u14
+
+import numpy as np
+
+from syx_cache import load_messages
+from syx_tools import EMU_ID, is_emu_proteus, emu_fields
 
 # Commands/subcommands we care about (from the spec):
 CMD_PRESET_DUMP = 0x10         # Preset Dump family
@@ -53,10 +57,8 @@ def decode_filter_params(payload: bytes):
     # Exactly 14 data bytes => seven 14-bit values (unsigned).
     # Per practice: vals[0] = filter_type_id; others are scalar params.
     if len(payload) != 14: return None
-    vals=[]
-    for i in range(0,14,2):
-        vals.append(midi_u14(payload[i], payload[i+1]))
-    return vals
+    # midi_u14 inlined over (lsb, msb) pairs
+    return [(lsb & 0x7F) | ((msb & 0x7F) << 7) for lsb, msb in zip(payload[0::2], payload[1::2])]
 
 def decode_generic_name(payload: bytes):
     """
@@ -68,9 +70,104 @@ def decode_generic_name(payload: bytes):
     tt = payload[0]
     obj  = u16(payload[1], payload[2])
     rom  = u16(payload[3], payload[4])
-    name = bytes(payload[5:5+16]).decode('ascii', errors='ignore').rstrip('\x00 ').strip()
+    # payload is a bytes slice of the message, so it decodes directly
+    name = payload[5:5+16].decode('ascii', errors='ignore').rstrip('\x00 ').strip()
     return tt, obj, rom, name
 
+@dataclass
+class ScrapeState:
+    """Presets and their layers as parallel columns (one entry per preset / per layer)."""
+    index: dict = field(default_factory=dict)  # (preset_num, rom_id) -> preset row
+    preset_num: list = field(default_factory=list)
+    rom_id: list = field(default_factory=list)
+    name: list = field(default_factory=list)       # None until a Generic Name arrives
+    arp_block: list = field(default_factory=list)
+    last_layer: list = field(default_factory=list)  # latest layer row of each preset, -1 if none
+    layer_preset: list = field(default_factory=list)
+    layer_index: list = field(default_factory=list)
+    filter_type_id: list = field(default_factory=list)  # -1 until a filter block arrives
+    filter_params: list = field(default_factory=list)
+    current_preset: int | None = None
+    layer_seq: int = 0  # fall-back layer sequencing if layer index isn't explicit
+
+    def preset(self, pn: int, rom: int) -> int:
+        """Row of preset (pn, rom), created on first sight"""
+        p = self.index.get((pn, rom))
+        if p is None:
+            p = self.index[(pn, rom)] = len(self.preset_num)
+            self.preset_num.append(pn)
+            self.rom_id.append(rom)
+            self.name.append(None)
+            self.arp_block.append(False)
+            self.last_layer.append(-1)
+        return p
+
+    def new_layer(self):
+        self.last_layer[self.current_preset] = len(self.layer_preset)
+        self.layer_preset.append(self.current_preset)
+        self.layer_index.append(self.layer_seq)
+        self.filter_type_id.append(-1)
+        self.filter_params.append(None)
+        self.layer_seq += 1
+
+def _on_hdr(payload: bytes, st: ScrapeState):
+    # Track preset context
+    decoded = decode_preset_header(payload)
+    if decoded:
+        # If we were in the middle of another preset, we implicitly finish it
+        # by just switching contexts; its rows in the ScrapeState columns are already filled.
+        pn, rom = decoded
+        # ensure record
+        st.current_preset = st.preset(pn, rom)
+        st.layer_seq = 0
+        print(f"[hdr] preset={pn} rom=0x{rom:04X}")
+
+def _on_arp(payload: bytes, st: ScrapeState):
+    if st.current_preset is not None:
+        st.arp_block[st.current_preset] = True
+
+def _on_layer_gen(payload: bytes, st: ScrapeState):
+    # We don't need to decode all general params yet; keep layer index sequence
+    # A Layer General block indicates a new layer context
+    if st.current_preset is not None:
+        # Start a new layer record (filter gets filled if/when 0x22 arrives)
+        st.new_layer()
+
+def _on_layer_filt(payload: bytes, st: ScrapeState):
+    vals = decode_filter_params(payload)
+    if vals and st.current_preset is not None:
+        # Ensure a layer exists; if not, create one with running index
+        if st.last_layer[st.current_preset] < 0:
+            st.new_layer()
+        # attach to the most recent (or create a new one if you prefer 1:1)
+        L = st.last_layer[st.current_preset]
+        st.filter_type_id[L] = int(vals[0])
+        st.filter_params[L]  = list(map(int, vals[1:]))
+
+def _on_name(payload: bytes, st: ScrapeState):
+    g = decode_generic_name(payload)
+    if g and g[0] == 1:  # tt==1 => Preset
+        _, obj_num, rom, name = g
+        st.name[st.preset(obj_num, rom)] = name
+
+def _histogram(values: np.ndarray) -> dict:
+    """{value: count}, keys in order of first appearance (as Counter would build it)"""
+    uniq, first, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first)
+    return dict(zip(uniq[order].tolist(), counts[order].tolist()))
+
+# One lookup per message: (cmd, sub) first, then commands that take any sub
+DISPATCH = {
+    (CMD_PRESET_DUMP, SUB_HDR_CLOSED): _on_hdr,
+    (CMD_PRESET_DUMP, SUB_HDR_OPEN):   _on_hdr,
+    (CMD_PRESET_DUMP, SUB_PRESET_ARP): _on_arp,
+    (CMD_PRESET_DUMP, SUB_LAYER_GEN):  _on_layer_gen,
+    (CMD_PRESET_DUMP, SUB_LAYER_FILT): _on_layer_filt,
+}
+CMD_DISPATCH = {
+    CMD_GENERIC_NAME: _on_name,
+}
+
 def main():
     ap = argparse.ArgumentParser(description="Scrape EMU Preset/Layer/Filter from SysEx")
     ap.add_argument("syx", help="Path to .syx file")
@@ -94,129 +191,61 @@ def main():
 
     name_re = re.compile(args.name_filter, re.IGNORECASE) if args.name_filter else DEFAULT_NAME_FILTER
 
-    msgs = split_sysex_file(args.syx)
-
-    # State keyed by (preset_num, rom_id)
-    presets = defaultdict(lambda: {
-        "name": None,
-        "rom_id": None,
-        "arp_block": False,
-        "layers": []  # each: {"layer_index": i, "filter_type_id": ftid, "filter_params": [..]}
-    })
-
-    current_preset = None
-
-    layer_seq = 0  # fall-back layer sequencing if layer index isn't explicit
+    msgs = load_messages(args.syx)
 
+    st = ScrapeState()
     for m in msgs:
-        if not is_emu_proteus(m):
+        # Every message starts F0 and ends F7, so m[1] exists; most fail on the maker ID
+        if m[1] != EMU_ID or not is_emu_proteus(m):
             continue
         dev, cmd, sub, payload = emu_fields(m)
-
-        # Track preset context
-        if cmd == CMD_PRESET_DUMP and sub in (SUB_HDR_CLOSED, SUB_HDR_OPEN):
-            decoded = decode_preset_header(payload)
-            if decoded:
-                # If we were in the middle of another preset, we implicitly finish it
-                # by just switching contexts; defaultdict has already accumulated it.
-                pn, rom = decoded
-                current_preset = (pn, rom)
-                # ensure record
-                presets[current_preset]["rom_id"] = rom
-                layer_seq = 0
-                print(f"[hdr] preset={pn} rom=0x{rom:04X}")
-
-        elif cmd == CMD_PRESET_DUMP and sub == SUB_PRESET_ARP:
-            if current_preset:
-                presets[current_preset]["arp_block"] = True
-
-        elif cmd == CMD_PRESET_DUMP and sub == SUB_LAYER_GEN:
-            # We don't need to decode all general params yet; keep layer index sequence
-            # A Layer General block indicates a new layer context
-            if current_preset:
-                # Start a new layer record (filter gets filled if/when 0x22 arrives)
-                presets[current_preset]["layers"].append({
-                    "layer_index": layer_seq,
-                    "filter_type_id": None,
-                    "filter_params": None
-                })
-                layer_seq += 1
-
-        elif cmd == CMD_PRESET_DUMP and sub == SUB_LAYER_FILT:
-            vals = decode_filter_params(payload)
-            if vals and current_preset:
-                # Ensure a layer exists; if not, create one with running index
-                if not presets[current_preset]["layers"]:
-                    presets[current_preset]["layers"].append({
-                        "layer_index": layer_seq,
-                        "filter_type_id": None,
-                        "filter_params": None
-                    })
-                    layer_seq += 1
-                # attach to the most recent (or create a new one if you prefer 1:1)
-                L = presets[current_preset]["layers"][-1]
-                L["filter_type_id"] = int(vals[0])
-                L["filter_params"]  = list(map(int, vals[1:]))
-
-        elif cmd == CMD_GENERIC_NAME:
-            g = decode_generic_name(payload)
-            if g and g[0] == 1:  # tt==1 => Preset
-                _, obj_num, rom, name = g
-                key = (obj_num, rom)
-                presets[key]["name"] = name
-                presets[key]["rom_id"] = rom
+        handler = DISPATCH.get((cmd, sub)) or CMD_DISPATCH.get(cmd)
+        if handler:
+            handler(payload, st)
 
     # Flatten & filter
-    rows=[]
-    for (pn, rom), rec in presets.items():
-        name = rec["name"] or ""
-        # Filter by ROM if user asked
-        if allowed_roms and (rom not in allowed_roms):
-            continue
-        # Filter by name keywords
-        if name and not name_re.search(name):
-            continue
-        # Emit one row per layer (so we don't lose multi-layer info)
-        if not rec["layers"]:
-            rows.append({
-                "preset_num": pn,
-                "rom_id": rom,
-                "preset_name": name,
-                "arp_present": int(rec["arp_block"]),
-                "layer_index": -1,
-                "filter_type_id": -1
-            })
-        else:
-            for L in rec["layers"]:
-                rows.append({
-                    "preset_num": pn,
-                    "rom_id": rom,
-                    "preset_name": name,
-                    "arp_present": int(rec["arp_block"]),
-                    "layer_index": L["layer_index"],
-                    "filter_type_id": (L["filter_type_id"] if L["filter_type_id"] is not None else -1)
-                })
+    names = [n or "" for n in st.name]
+    keep = np.array([
+        # Filter by ROM if user asked, and by name keywords
+        (not allowed_roms or rom in allowed_roms) and (not name or bool(name_re.search(name)))
+        for rom, name in zip(st.rom_id, names)
+    ], dtype=bool)
+    layer_preset = np.array(st.layer_preset, dtype=np.int64)
+    kept_layers = np.flatnonzero(keep[layer_preset]) if layer_preset.size else layer_preset
+    # Emit one row per layer (so we don't lose multi-layer info); a preset without
+    # layers still gets one row, with layer -1
+    bare = np.flatnonzero(keep & (np.array(st.last_layer, dtype=np.int64) < 0))
+    row_preset = np.concatenate((layer_preset[kept_layers], bare))
+    row_layer = np.concatenate((np.array(st.layer_index, dtype=np.int64)[kept_layers], np.full(bare.size, -1)))
+    row_ftid = np.concatenate((np.array(st.filter_type_id, dtype=np.int64)[kept_layers], np.full(bare.size, -1)))
+    # rows follow preset first-seen order, layers in arrival order within each
+    first_seen = np.argsort(row_preset, kind="stable")
+    row_preset, row_layer, row_ftid = row_preset[first_seen], row_layer[first_seen], row_ftid[first_seen]
+    row_pn = np.array(st.preset_num, dtype=np.int64)[row_preset]
+    row_rom = np.array(st.rom_id, dtype=np.int64)[row_preset]
+    row_arp = np.array(st.arp_block, dtype=np.int64)[row_preset]
 
     outp = Path(args.out_csv)
     outp.parent.mkdir(parents=True, exist_ok=True)
-    with outp.open("w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["preset_num","rom_id","preset_name","arp_present","layer_index","filter_type_id"])
-        w.writeheader()
-        for r in sorted(rows, key=lambda r:(r["rom_id"], r["preset_num"], r["layer_index"])):
-            w.writerow(r)
-
-    # ROM ID histogram for analysis
-    from collections import Counter
-    rom_histogram = Counter(r["rom_id"] for r in rows)
-    print(f"[+] Parsed {len(msgs)} SysEx messages; collected {len(presets)} presets; wrote {outp}")
-    print(f"[+] ROM ID histogram: {dict(rom_histogram)}")
+    fieldnames = ["preset_num","rom_id","preset_name","arp_present","layer_index","filter_type_id"]
+    # sort by (rom_id, preset_num, layer_index); lexsort is stable, ties keep row order
+    order = np.lexsort((row_layer, row_pn, row_rom))
+    with outp.open("w", newline="", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows(zip(row_pn[order].tolist(), row_rom[order].tolist(),
+                        [names[p] for p in row_preset[order].tolist()], row_arp[order].tolist(),
+                        row_layer[order].tolist(), row_ftid[order].tolist()))
+
+    # ROM ID histogram for analysis, keyed in first-seen order
+    print(f"[+] Parsed {len(msgs)} SysEx messages; collected {len(st.index)} presets; wrote {outp}")
+    print(f"[+] ROM ID histogram: {_histogram(row_rom)}")
 
     # Filter type histogram if available
-    filter_types = [r["filter_type_id"] for r in rows if r["filter_type_id"] != -1]
-    if filter_types:
-        filter_histogram = Counter(filter_types)
-        print(f"[+] Filter type IDs found: {sorted(set(filter_types))}")
-        print(f"[+] Filter histogram: {dict(filter_histogram)}")
+    filter_types = row_ftid[row_ftid != -1]
+    if filter_types.size:
+        print(f"[+] Filter type IDs found: {np.unique(filter_types).tolist()}")
+        print(f"[+] Filter histogram: {_histogram(filter_types)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
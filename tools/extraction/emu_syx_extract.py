@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
-import argparse, json, math, struct, os
+import argparse, math, struct, os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from syx_tools import split_and_unpack, analyze_sysex_file
+from syx_tools import split_and_unpack, analyze_sysex_file, write_json
 from probe_shapes import extract_candidate_shapes, shapes_to_compiled_json
 
+def _process_priority_file(path):
+    """(file_info, shapes) for one SysEx file, read once and shared by both analyses"""
+    raw = Path(path).read_bytes()
+    # Analyze the file structure
+    info = analyze_sysex_file(raw)
+    # Extract candidate shapes
+    shapes = extract_candidate_shapes(raw)
+    return info, shapes
+
 def extract_priority_sounds(base_dir):
     """Extract Z-plane data from priority EMU sounds."""
 
@@ -32,35 +42,38 @@ def extract_priority_sounds(base_dir):
     results = {}
     all_shapes = []
 
-    for rel_path in priority_files:
-        full_path = Path(base_dir) / rel_path
-        if not full_path.exists():
-            print(f"Warning: {rel_path} not found")
-            continue
+    # Files are independent: analyze them in worker processes, report in list order
+    with ProcessPoolExecutor() as ex:
+        pending = {}
+        for rel_path in priority_files:
+            full_path = Path(base_dir) / rel_path
+            if full_path.exists():
+                pending[rel_path] = ex.submit(_process_priority_file, str(full_path))
 
-        print(f"Processing: {rel_path}")
+        for rel_path in priority_files:
+            if rel_path not in pending:
+                print(f"Warning: {rel_path} not found")
+                continue
 
-        try:
-            # Analyze the file structure
-            info = analyze_sysex_file(str(full_path))
+            print(f"Processing: {rel_path}")
 
-            # Extract candidate shapes
-            shapes = extract_candidate_shapes(str(full_path))
+            try:
+                info, shapes = pending[rel_path].result()
 
-            results[rel_path] = {
-                "file_info": info,
-                "shapes_found": len(shapes),
-                "shapes": shapes[:5] if shapes else []  # Store first 5 for inspection
-            }
+                results[rel_path] = {
+                    "file_info": info,
+                    "shapes_found": len(shapes),
+                    "shapes": shapes[:5] if shapes else []  # Store first 5 for inspection
+                }
 
-            # Add to master list
-            all_shapes.extend(shapes)
+                # Add to master list
+                all_shapes.extend(shapes)
 
-            print(f"  Found {len(shapes)} candidate shapes")
+                print(f"  Found {len(shapes)} candidate shapes")
 
-        except Exception as e:
-            print(f"  Error processing {rel_path}: {e}")
-            results[rel_path] = {"error": str(e)}
+            except Exception as e:
+                print(f"  Error processing {rel_path}: {e}")
+                results[rel_path] = {"error": str(e)}
 
     return results, all_shapes
 
@@ -107,8 +120,7 @@ def main():
             }
         }
 
-        with open(args.output, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        write_json(args.output, output_data)
 
         print(f"  Unique shapes: {compiled['count']}")
         print(f"  Output saved to: {args.output}")
@@ -7,11 +7,26 @@ Extracts samples and preset data from EXB files for Z-plane morphing system
 import os
 import sys
 import struct
-import json
-import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
+
+from syx_tools import map_file, write_json
+
+# EBL sample data is written out as 16-bit mono 44.1kHz PCM
+WAV_SAMPLE_RATE = 44100
+WAV_BITS_PER_SAMPLE = 16
+WAV_NUM_CHANNELS = 1
+WAV_BYTE_RATE = WAV_SAMPLE_RATE * WAV_NUM_CHANNELS * WAV_BITS_PER_SAMPLE // 8
+WAV_BLOCK_ALIGN = WAV_NUM_CHANNELS * WAV_BITS_PER_SAMPLE // 8
+# RIFF/WAVE header with a single fmt chunk, followed by the data chunk header
+_WAV_HDR = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
 class EBLExtractor:
     """Extract and convert .ebl files to WAV format"""
 
@@ -21,39 +36,30 @@ class EBLExtractor:
     def extract_ebl_to_wav(self, ebl_path: str, output_dir: str) -> Optional[str]:
         """Convert EBL file to WAV format"""
         try:
-            with open(ebl_path, 'rb') as f:
-                data = f.read()
-
             # EBL format detection - look for audio data signature
-            if len(data) < self.ebl_header_size:
+            size = os.path.getsize(ebl_path)
+            if size < self.ebl_header_size:
                 return None
 
-            # Skip EBL header and extract raw audio data
-            audio_data = data[self.ebl_header_size:]
+            # Raw audio data follows the EBL header; it is streamed, never loaded
+            data_size = size - self.ebl_header_size
 
-            if len(audio_data) < 100:  # Skip very small files
+            if data_size < 100:  # Skip very small files
                 return None
 
-            # Create WAV header for 16-bit mono 44.1kHz
-            sample_rate = 44100
-            bits_per_sample = 16
-            num_channels = 1
-            byte_rate = sample_rate * num_channels * bits_per_sample // 8
-            block_align = num_channels * bits_per_sample // 8
-            data_size = len(audio_data)
-
-            wav_header = struct.pack('<4sI4s4sIHHIIHH4sI',
+            # WAV header for 16-bit mono 44.1kHz; only the sizes vary per file
+            wav_header = _WAV_HDR.pack(
                 b'RIFF',
                 36 + data_size,
                 b'WAVE',
                 b'fmt ',
                 16,  # PCM format chunk size
                 1,   # PCM format
-                num_channels,
-                sample_rate,
-                byte_rate,
-                block_align,
-                bits_per_sample,
+                WAV_NUM_CHANNELS,
+                WAV_SAMPLE_RATE,
+                WAV_BYTE_RATE,
+                WAV_BLOCK_ALIGN,
+                WAV_BITS_PER_SAMPLE,
                 b'data',
                 data_size
             )
@@ -62,9 +68,10 @@ class EBLExtractor:
             filename = Path(ebl_path).stem.replace('Xtreme Lead-1SL', 'sample_')
             wav_path = os.path.join(output_dir, f"{filename}.wav")
 
-            with open(wav_path, 'wb') as f:
-                f.write(wav_header)
-                f.write(audio_data)
+            with open(ebl_path, 'rb') as src, open(wav_path, 'wb') as dst:
+                dst.write(wav_header)
+                src.seek(self.ebl_header_size)
+                shutil.copyfileobj(src, dst, 1 << 20)
 
             return wav_path
 
@@ -72,48 +79,108 @@ class EBLExtractor:
             print(f"Warning: Failed to convert {ebl_path}: {e}")
             return None
 
+def _ebl_to_wav_worker(ebl_path: str, output_dir: str) -> Optional[str]:
+    """Process-pool entry point for EBLExtractor.extract_ebl_to_wav"""
+    return EBLExtractor().extract_ebl_to_wav(ebl_path, output_dir)
+
+def _text_runs(arr: np.ndarray, min_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(starts, ends) of the printable runs in arr at least min_length long.
+
+    A run that reaches the end of arr is not terminated, so it is not reported.
+    """
+    printable = ((arr >= 0x20) & (arr <= 0x7e)).view(np.int8)
+    # +1 where a printable run starts, -1 one past where it ends
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], printable, [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    keep = ((ends - starts) >= min_length) & (ends < len(arr))
+    return starts[keep], ends[keep]
+
+# Bytes of the file lowered and searched at a time by find_keyword_regions
+_SCAN_WINDOW = 1 << 20
+_PRINTABLE = bytes(range(0x20, 0x7f))
+
+def _printable_run(data: bytes, i: int) -> Tuple[int, int]:
+    """(start, end) of the printable run in data around offset i, via bytes strips over growing slices"""
+    step = 256
+    start = i
+    while start:
+        lo = max(0, start - step)
+        window = data[lo:start]
+        kept = len(window.rstrip(_PRINTABLE))
+        start = lo + kept
+        if kept:
+            break
+        step *= 2
+    step = 256
+    end = i
+    while end < len(data):
+        window = data[end:end + step]
+        prefix = len(window) - len(window.lstrip(_PRINTABLE))
+        end += prefix
+        if prefix < len(window):
+            break
+        step *= 2
+    return start, end
+
 class EXBPresetExtractor:
     """Extract preset/instrument data from main EXB file"""
 
-    def __init__(self):
+    # Preset-like names, matched case-insensitively (text regions are ASCII)
+    PRESET_KEYWORDS = (b'lead', b'bass', b'pad', b'arp', b'seq')
+
+    def __init__(self, min_length: int = 6):
         self.preset_patterns = [
             rb'[A-Za-z0-9 ]{8,32}',  # Preset names
             rb'Filter',               # Filter sections
             rb'LFO',                  # LFO sections
             rb'ENV',                  # Envelope sections
         ]
+        self.min_length = min_length
 
-    def find_text_regions(self, data: bytes, min_length: int = 6) -> List[Tuple[int, str]]:
+    def find_text_regions(self, data: bytes, min_length: Optional[int] = None) -> List[Tuple[int, str]]:
         """Find printable text regions in binary data"""
-        text_regions = []
-        current_text = ""
-        start_pos = 0
-
-        for i, byte in enumerate(data):
-            if 32 <= byte <= 126:  # Printable ASCII
-                if not current_text:
-                    start_pos = i
-                current_text += chr(byte)
-            else:
-                if len(current_text) >= min_length:
-                    text_regions.append((start_pos, current_text))
-                current_text = ""
-
-        return text_regions
+        if min_length is None:
+            min_length = self.min_length
+        starts, ends = _text_runs(np.frombuffer(data, dtype=np.uint8), min_length)
+        return [(s, data[s:e].decode('ascii')) for s, e in zip(starts.tolist(), ends.tolist())]
+
+    def find_keyword_regions(self, data: bytes, min_length: Optional[int] = None) -> List[Tuple[int, str]]:
+        """The text regions of find_text_regions that contain a preset keyword, found from the keyword hits"""
+        if min_length is None:
+            min_length = self.min_length
+        n = len(data)
+        # Search ASCII-lowered windows, so a mapped file is never copied whole; windows
+        # overlap by one keyword length less one, and a hit belongs to the window it starts in
+        overlap = max(map(len, self.PRESET_KEYWORDS)) - 1
+        regions = []
+        end = -1
+        for pos in range(0, n, _SCAN_WINDOW):
+            folded = data[pos:pos + _SCAN_WINDOW + overlap].lower()
+            hits = []
+            for keyword in self.PRESET_KEYWORDS:
+                i = folded.find(keyword, 0, _SCAN_WINDOW + len(keyword) - 1)
+                while i >= 0:
+                    hits.append(pos + i)
+                    i = folded.find(keyword, i + len(keyword), _SCAN_WINDOW + len(keyword) - 1)
+            for hit in sorted(hits):
+                if hit < end:  # inside the run already handled
+                    continue
+                start, end = _printable_run(data, hit)
+                # As in find_text_regions, a run that reaches the end of data is not reported
+                if end - start >= min_length and end < n:
+                    regions.append((start, data[start:end].decode('ascii')))
+        return regions
 
     def extract_preset_data(self, exb_path: str) -> Dict:
         """Extract preset definitions from EXB file"""
         try:
-            with open(exb_path, 'rb') as f:
-                data = f.read()
-
-            # Find text regions that might contain preset names
-            text_regions = self.find_text_regions(data)
+            # Mapped, not read: only the text scan and the context slices touch the file
+            with map_file(exb_path) as data:
+                # Find text regions with preset-like names
+                text_regions = self.find_keyword_regions(data)
 
-            presets = []
-            for offset, text in text_regions:
-                # Look for preset-like names
-                if any(keyword in text.lower() for keyword in ['lead', 'bass', 'pad', 'arp', 'seq']):
+                presets = []
+                for offset, text in text_regions:
                     # Extract surrounding binary data for parameter analysis
                     context_start = max(0, offset - 512)
                     context_end = min(len(data), offset + len(text) + 512)
@@ -122,7 +189,8 @@ class EXBPresetExtractor:
                     preset = {
                         'name': text.strip(),
                         'offset': offset,
-                        'context_hex': context_data.hex(),
+                        # Byte range of the context in exb_path; re-slice the file if the bytes are needed
+                        'context_ref': (context_start, context_end),
                         'parameters': self.extract_parameters_from_context(context_data)
                     }
                     presets.append(preset)
@@ -149,17 +217,16 @@ class EXBPresetExtractor:
 
         # Look for parameter-like byte patterns
         # This is heuristic - would need reverse engineering for exact mapping
-        for i in range(0, len(context_data) - 4, 4):
-            value = struct.unpack('<f', context_data[i:i+4])[0] if len(context_data[i:i+4]) == 4 else 0
-
-            # Map to reasonable parameter ranges
-            if 0.0 <= value <= 1.0:
-                if i % 16 == 0:
-                    params['morph'] = value
-                elif i % 16 == 4:
-                    params['intensity'] = value
-                elif i % 16 == 8:
-                    params['drive'] = value
+        # Floats on a 4-byte grid, excluding one that ends exactly at the end of the window
+        count = max(0, (len(context_data) - 1) // 4)
+        values = np.frombuffer(context_data, dtype='<f4', count=count)
+        in_range = (values >= 0.0) & (values <= 1.0)
+        # Map to reasonable parameter ranges: the last in-range value in
+        # each 16-byte lane wins
+        for lane, key in enumerate(('morph', 'intensity', 'drive')):
+            hits = np.flatnonzero(in_range[lane::4])
+            if hits.size:
+                params[key] = float(values[lane::4][hits[-1]])
 
         return params
 
@@ -251,17 +318,19 @@ def main():
 
     # Extract samples from EBL files
     print("Extracting samples...")
-    ebl_extractor = EBLExtractor()
     sample_files = []
 
-    ebl_files = [f for f in os.listdir(sample_pool_dir) if f.endswith('.ebl')][:32]  # Limit samples
-    for i, ebl_file in enumerate(ebl_files):
-        ebl_path = os.path.join(sample_pool_dir, ebl_file)
-        wav_path = ebl_extractor.extract_ebl_to_wav(ebl_path, samples_dir)
+    # Entries are read lazily, so the listing stops at the 32nd EBL file (limit samples)
+    with os.scandir(sample_pool_dir) as entries:
+        ebl_paths = list(islice((e.path for e in entries if e.name.endswith('.ebl') and e.is_file()), 32))
+    # Each EBL maps to its own WAV; results come back in listing order
+    with ProcessPoolExecutor() as ex:
+        wav_paths = list(ex.map(partial(_ebl_to_wav_worker, output_dir=samples_dir), ebl_paths, chunksize=4))
+    for i, wav_path in enumerate(wav_paths):
         if wav_path:
             sample_files.append(os.path.basename(wav_path))
             if i % 10 == 0:
-                print(f"  Processed {i}/{len(ebl_files)} samples...")
+                print(f"  Processed {i}/{len(ebl_paths)} samples...")
 
     print(f"Extracted {len(sample_files)} samples")
 
@@ -296,8 +365,7 @@ def main():
 
     # Save bank file
     bank_file = os.path.join(output_dir, 'extracted_bank.json')
-    with open(bank_file, 'w') as f:
-        json.dump(bank, f, indent=2)
+    write_json(bank_file, bank)
 
     print(f"\nExtraction complete!")
     print(f"Bank file: {bank_file}")
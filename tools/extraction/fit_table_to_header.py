@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # fit_table_to_header.py
-# Usage: python fit_table_to_header.py <csvfile> <out_header.h> --name T1_table --npoints 128
+# Usage: python fit_table_to_header.py <csvfile|npyfile> <out_header.h> --name T1_table --npoints 128
 # Requires: numpy. scipy optional for smoother spline.
 
 import sys, os, argparse
@@ -13,6 +13,9 @@ except Exception:
     SCIPY_AVAILABLE = False
 
 def load_csv(path):
+    # .npy copies of the tables (see generate_zplane_tables.py) load without text parsing
+    if path.endswith('.npy'):
+        return np.load(path)
     arr = np.loadtxt(path, delimiter=',')
     return arr
 
@@ -5,9 +5,12 @@ Creates SysEx messages to request filter parameters from EMU devices.
 """
 
 import sys
+import struct
 import argparse
 from pathlib import Path
 
+import numpy as np
+
 # Add project root to path
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
@@ -19,11 +22,8 @@ PRODUCT_ID = 0x0F       # Proteus Family
 COMMAND_PRESET_DUMP_REQUEST = 0x10
 SUBCOMMAND_LAYER_FILTER_PARAMS_DUMP_REQUEST = 0x22
 
-def u16_to_bytes(value: int) -> tuple[int, int]:
-    """Converts a 14-bit unsigned integer to two 7-bit bytes (LSB first)."""
-    lsb = value & 0x7F
-    msb = (value >> 7) & 0x7F
-    return lsb, msb
+# One request message: 14 unsigned bytes, packed in a single call
+_MSG_STRUCT = struct.Struct('14B')
 
 def generate_filter_param_request(
     device_id: int,
@@ -40,11 +40,8 @@ def generate_filter_param_request(
         yy yy    = Layer Number (LSB first)
         zz zz    = Preset ROM ID (LSB first)
     """
-    preset_lsb, preset_msb = u16_to_bytes(preset_number)
-    layer_lsb, layer_msb = u16_to_bytes(layer_number)
-    rom_lsb, rom_msb = u16_to_bytes(rom_id)
-
-    message = bytes([
+    # 14-bit values are split into two 7-bit bytes (LSB first)
+    return _MSG_STRUCT.pack(
         0xF0,
         MANUFACTURER_ID,
         PRODUCT_ID,
@@ -52,12 +49,56 @@ def generate_filter_param_request(
         0x55, # Special Editor designator byte (fixed value)
         COMMAND_PRESET_DUMP_REQUEST,
         SUBCOMMAND_LAYER_FILTER_PARAMS_DUMP_REQUEST,
-        preset_lsb, preset_msb,
-        layer_lsb, layer_msb,
-        rom_lsb, rom_msb,
+        preset_number & 0x7F, (preset_number >> 7) & 0x7F,
+        layer_number & 0x7F, (layer_number >> 7) & 0x7F,
+        rom_id & 0x7F, (rom_id >> 7) & 0x7F,
         0xF7
-    ])
-    return message
+    )
+
+def filter_param_request_block(
+    device_id: int,
+    max_presets: int,
+    max_layers: int,
+    rom_id: int
+) -> np.ndarray:
+    """
+    The requests for layers 0..max_layers-1 of presets 0..max_presets-1 as one
+    C-contiguous (max_presets, max_layers, 14) uint8 array, ready to be written as is.
+    """
+    max_presets, max_layers = max(max_presets, 0), max(max_layers, 0)
+    presets = np.arange(max_presets)[:, None]
+    layers = np.arange(max_layers)
+
+    # One 14-byte message per (preset, layer); the preset and layer columns are broadcast
+    messages = np.empty((max_presets, max_layers, 14), dtype=np.uint8)
+    messages[..., :7] = (
+        0xF0,
+        MANUFACTURER_ID,
+        PRODUCT_ID,
+        device_id,
+        0x55, # Special Editor designator byte (fixed value)
+        COMMAND_PRESET_DUMP_REQUEST,
+        SUBCOMMAND_LAYER_FILTER_PARAMS_DUMP_REQUEST,
+    )
+    messages[..., 7] = presets & 0x7F
+    messages[..., 8] = (presets >> 7) & 0x7F
+    messages[..., 9] = layers & 0x7F
+    messages[..., 10] = (layers >> 7) & 0x7F
+    messages[..., 11:13] = (rom_id & 0x7F, (rom_id >> 7) & 0x7F)
+    messages[..., 13] = 0xF7
+    return messages
+
+def generate_filter_param_requests(
+    device_id: int,
+    max_presets: int,
+    max_layers: int,
+    rom_id: int
+) -> bytes:
+    """
+    Generates the requests for layers 0..max_layers-1 of presets 0..max_presets-1,
+    preset-major: the same messages generate_filter_param_request builds, concatenated.
+    """
+    return filter_param_request_block(device_id, max_presets, max_layers, rom_id).tobytes()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -118,26 +159,22 @@ Examples:
         rom_name = discovered_roms.get(rom_id, f"ROM_{rom_id:04X}")
         print(f"\nCreating filter parameter requests for ROM {rom_id:04X} ({rom_name})")
         
-        all_requests = []
-        for preset_num in range(max_presets):
-            for layer_num in range(max_layers):
-                request_msg = generate_filter_param_request(
-                    device_id=device_id,
-                    preset_number=preset_num,
-                    layer_number=layer_num,
-                    rom_id=rom_id
-                )
-                all_requests.append(request_msg)
+        requests = filter_param_request_block(
+            device_id=device_id,
+            max_presets=max_presets,
+            max_layers=max_layers,
+            rom_id=rom_id
+        )
+        num_requests = requests.shape[0] * requests.shape[1]
         
-        # Save to file
+        # Save to file: the whole block in one write, straight from the array buffer
         output_filename = output_dir / f"filter_requests_rom_{rom_id:04X}_device_{device_id}.syx"
         with open(output_filename, "wb") as f:
-            for req in all_requests:
-                f.write(req)
+            f.write(requests)
         
-        print(f"  Created {len(all_requests)} filter parameter requests")
+        print(f"  Created {num_requests} filter parameter requests")
         print(f"  Saved to: {output_filename}")
-        total_requests += len(all_requests)
+        total_requests += num_requests
     
     print(f"\n[SUCCESS] Generated {total_requests} total filter parameter requests")
     print(f"Files saved in: {output_dir}")
@@ -10,10 +10,21 @@ import sys
 from pathlib import Path
 from typing import List, Dict
 
+# Per-section saturation weights by shape character
+_HIGH_SECTIONS = (0.8, 1.0, 1.2, 1.4, 1.3, 1.1)  # More saturation in higher sections
+_LOW_SECTIONS = (1.4, 1.2, 1.0, 0.8, 0.6, 0.7)   # More saturation in lower sections
+SATURATION_CURVES = {
+    'bright': _HIGH_SECTIONS, 'cutting': _HIGH_SECTIONS, 'harsh': _HIGH_SECTIONS,
+    'warm': _LOW_SECTIONS, 'deep': _LOW_SECTIONS,
+}
+BALANCED_SATURATION = (1.0,) * 6  # Mid, balanced: even saturation distribution
+
 class MorphingPresetGenerator:
     """Generate authentic morphing filter presets"""
 
     def __init__(self):
+        # Looked up by name in create_preset and written into the bank as-is, so it
+        # stays a plain dict: a lookup here is cheaper than indexing a NumPy record
         self.shape_library = {
             # Vowel shapes for vocal-style morphing
             'Vowel_Ae': {'type': 'vowel', 'character': 'bright', 'q_scale': 3.0},
@@ -195,36 +206,11 @@ class MorphingPresetGenerator:
         character = shape_info.get('character', 'mid')
 
         # Adjust saturation based on character
-        if character in ['bright', 'cutting', 'harsh']:
-            # More saturation in higher sections
-            saturations = [
-                base_saturation * 0.8,
-                base_saturation * 1.0,
-                base_saturation * 1.2,
-                base_saturation * 1.4,
-                base_saturation * 1.3,
-                base_saturation * 1.1
-            ]
-        elif character in ['warm', 'deep']:
-            # More saturation in lower sections
-            saturations = [
-                base_saturation * 1.4,
-                base_saturation * 1.2,
-                base_saturation * 1.0,
-                base_saturation * 0.8,
-                base_saturation * 0.6,
-                base_saturation * 0.7
-            ]
-        else:  # Mid, balanced
-            # Even saturation distribution
-            saturations = [base_saturation * 1.0] * 6
-
-        # Apply intensity scaling
-        intensity_scale = 0.5 + (intensity * 0.5)  # 0.5 to 1.0 range
-        saturations = [s * intensity_scale for s in saturations]
+        curve = SATURATION_CURVES.get(character, BALANCED_SATURATION)
 
-        # Clamp to valid range
-        return [max(0.0, min(1.0, s)) for s in saturations]
+        # Apply intensity scaling and clamp to valid range, in one pass
+        intensity_scale = 0.5 + (intensity * 0.5)  # 0.5 to 1.0 range
+        return [max(0.0, min(1.0, base_saturation * w * intensity_scale)) for w in curve]
 
     def create_preset(self, template: Dict, samples: List[str]) -> Dict:
         """Create a complete Z-plane preset from template"""
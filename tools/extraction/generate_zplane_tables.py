@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 # generate_zplane_tables.py - Create authentic Z-plane mapping tables based on EMU characteristics
+import functools
 import numpy as np
 import sys
 import os
 
+@functools.lru_cache(maxsize=None)
+def _t(npoints):
+    """Shared read-only np.linspace(0, 1, npoints), built once per table length"""
+    t = np.linspace(0, 1, npoints)
+    t.flags.writeable = False
+    return t
+
 def generate_t1_cutoff_table(npoints=128):
     """Generate T1 -> cutoff frequency mapping (20Hz to 20kHz, EMU-style exponential)"""
     # EMU Z-plane filters use exponential frequency mapping with musical intervals
     # T1 typically controls primary cutoff with exponential response
-    t = np.linspace(0, 1, npoints)
+    t = _t(npoints)
 
     # EMU-style exponential mapping: 20Hz to 20kHz with musical scaling
     # This creates more resolution in the musical frequency range
@@ -17,14 +25,17 @@ def generate_t1_cutoff_table(npoints=128):
 
     # Exponential curve with slight S-curve for better musical control
     # Based on typical EMU filter response characteristics
-    exp_curve = np.power(t, 0.75)  # Slightly compressed exponential
-    frequencies = freq_min * np.power(freq_max / freq_min, exp_curve)
+    # freq_min * (freq_max/freq_min) ** t**0.75, as a single exp over one buffer
+    frequencies = np.power(t, 0.75)  # Slightly compressed exponential
+    frequencies *= np.log(freq_max / freq_min)
+    np.exp(frequencies, out=frequencies)
+    frequencies *= freq_min
 
     return frequencies
 
 def generate_t2_resonance_table(npoints=128):
     """Generate T2 -> resonance/Q mapping (EMU-style resonance control)"""
-    t = np.linspace(0, 1, npoints)
+    t = _t(npoints)
 
     # EMU resonance typically ranges from subtle (Q=0.7) to very resonant (Q=20+)
     # with exponential scaling for musical control
@@ -32,34 +43,46 @@ def generate_t2_resonance_table(npoints=128):
     q_max = 25.0
 
     # Exponential resonance curve - more control in lower Q range
-    resonance = q_min * np.power(q_max / q_min, np.power(t, 1.2))
+    resonance = np.power(t, 1.2)
+    resonance *= np.log(q_max / q_min)
+    np.exp(resonance, out=resonance)
+    resonance *= q_min
 
     return resonance
 
 def generate_t1_morphing_factors(npoints=128):
     """Generate T1 morphing factors for filter pole positioning"""
-    t = np.linspace(0, 1, npoints)
+    t = _t(npoints)
 
     # Z-plane morphing affects filter topology
     # T1 typically controls primary frequency shift with harmonic content
-    morph_factors = 0.5 + 0.3 * np.sin(2 * np.pi * t) + 0.2 * t
-    morph_factors = np.clip(morph_factors, 0.1, 1.9)  # Keep in stable range
+    # 0.5 + 0.3*sin(2*pi*t) + 0.2*t, accumulated in one buffer
+    morph_factors = np.sin(2 * np.pi * t)
+    morph_factors *= 0.3
+    morph_factors += 0.5
+    morph_factors += 0.2 * t
+    np.clip(morph_factors, 0.1, 1.9, out=morph_factors)  # Keep in stable range
 
     return morph_factors
 
 def generate_t2_morphing_factors(npoints=128):
     """Generate T2 morphing factors for filter resonance morphing"""
-    t = np.linspace(0, 1, npoints)
+    t = _t(npoints)
 
     # T2 typically controls secondary characteristics and filter shape
-    morph_factors = 0.8 + 0.4 * np.cos(np.pi * t) + 0.3 * np.power(t, 0.5)
-    morph_factors = np.clip(morph_factors, 0.2, 2.0)  # Keep in stable range
+    # 0.8 + 0.4*cos(pi*t) + 0.3*sqrt(t), accumulated in one buffer
+    morph_factors = np.cos(np.pi * t)
+    morph_factors *= 0.4
+    morph_factors += 0.8
+    morph_factors += 0.3 * np.sqrt(t)
+    np.clip(morph_factors, 0.2, 2.0, out=morph_factors)  # Keep in stable range
 
     return morph_factors
 
 def export_table_csv(data, filename):
-    """Export table data to CSV"""
+    """Export table data to CSV, plus a binary .npy copy that loads without text parsing"""
     np.savetxt(filename, data, fmt='%.9g', delimiter=',')
+    np.save(os.path.splitext(filename)[0] + '.npy', data)
     print(f"Generated: {filename}")
 
 def main():
@@ -4,14 +4,44 @@ EMU Proteus Family SysEx Parser
 Follows Proteus Family SysEx 2.2 spec to extract preset information.
 """
 
+import io
+import os
 import sys
 import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 from collections import defaultdict
+from operator import itemgetter
+
+try:
+    from tools.extraction.syx_tools import map_file
+except ImportError:  # run from tools/extraction itself
+    from syx_tools import map_file
 
 def parse_sysex_file(path: Path):
     """Parse a single EMU SysEx .syx file and extract preset info"""
-    data = path.read_bytes()
+    # A view of the mapped file: indexing and payload slices never copy file data
+    with map_file(path) as mapped, memoryview(mapped) as data:
+        return _parse_sysex_data(path, data)
+
+def parse_sysex_file_logged(path: Path):
+    """
+    Parse one file, typically in a worker process.
+
+    Returns (rows, log, error): the parser's own warnings are captured in log so
+    the caller can print them in input order; error is the exception text or None.
+    """
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log):
+            rows = parse_sysex_file(path)
+    except Exception as e:
+        return [], log.getvalue(), str(e)
+    return rows, log.getvalue(), None
+
+def _parse_sysex_data(path: Path, data):
     results = []
 
     # SysEx starts with F0, ends with F7
@@ -83,7 +113,8 @@ def parse_sysex_file(path: Path):
         payload = data[7:-1]  # strip F0 header + F7
         # Expected: 14 bytes = 7×14-bit values (LSB first pairs)
         if len(payload) == 14:
-            # Decode 7×14-bit values
+            # Decode 7×14-bit values. Kept as a plain loop: for a single 14-byte
+            # payload NumPy's frombuffer/astype setup costs more than the loop itself
             filter_params = []
             for i in range(0, 14, 2):
                 lsb = payload[i]
@@ -115,77 +146,99 @@ def parse_sysex_file(path: Path):
     return results
 
 
+# Column order of merged preset rows and of the output CSV
+ROW_FIELDS = ("filename", "preset_num", "rom_id", "preset_name", "layer_index", "filter_type_id", "message_type")
+
 def merge_names_with_headers(rows):
     """
     Merge preset names from 0x0B messages into header rows.
-    Returns a list where each preset has its name if available.
+    Returns one tuple per preset (fields in ROW_FIELDS order) with its name if available.
     """
-    # Group by (preset_num, rom_id) to merge names
-    preset_dict = defaultdict(lambda: {
-        "filename": "", 
-        "preset_num": 0, 
-        "rom_id": 0, 
-        "preset_name": "",
-        "layer_index": -1,
-        "filter_type_id": -1,
-        "message_type": "header"
-    })
+    # Group by (preset_num, rom_id) to merge names: the key maps to a row index into
+    # per-field columns, so a preset seen again only updates fields in place
+    index = {}
+    filenames, preset_nums, rom_ids, preset_names = [], [], [], []
+    layer_indices, filter_type_ids, message_types = [], [], []
     
     for row in rows:
         key = (row["preset_num"], row["rom_id"])
+        i = index.setdefault(key, len(index))
+        
+        if i == len(filenames):
+            filenames.append(row["filename"])
+            preset_nums.append(row["preset_num"])
+            rom_ids.append(row["rom_id"])
+            preset_names.append(row["preset_name"] or "")
+            layer_indices.append(row.get("layer_index", -1))
+            filter_type_ids.append(row.get("filter_type_id", -1))
+            message_types.append(row.get("message_type", "header"))
+            continue
         
         # If this row has a name, use it
         if row["preset_name"]:
-            preset_dict[key]["preset_name"] = row["preset_name"]
+            preset_names[i] = row["preset_name"]
         
         # Always update the other fields
-        preset_dict[key]["filename"] = row["filename"]
-        preset_dict[key]["preset_num"] = row["preset_num"]
-        preset_dict[key]["rom_id"] = row["rom_id"]
-        preset_dict[key]["layer_index"] = row.get("layer_index", -1)
-        preset_dict[key]["filter_type_id"] = row.get("filter_type_id", -1)
-        preset_dict[key]["message_type"] = row.get("message_type", "header")
+        filenames[i] = row["filename"]
+        layer_indices[i] = row.get("layer_index", -1)
+        filter_type_ids[i] = row.get("filter_type_id", -1)
+        message_types[i] = row.get("message_type", "header")
     
-    # Convert back to list
-    return list(preset_dict.values())
+    # Columns back to a list of rows
+    return list(zip(filenames, preset_nums, rom_ids, preset_names, layer_indices, filter_type_ids, message_types))
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python parse_emu_sysex.py <out.csv> <files.syx...>")
-        print("Example: python parse_emu_sysex.py emu_presets.csv *.syx")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Parse EMU Proteus SysEx files into a preset CSV.",
+        epilog="Example: python parse_emu_sysex.py emu_presets.csv *.syx"
+    )
+    parser.add_argument("out_csv", type=Path, help="Output CSV file path")
+    parser.add_argument("files", nargs="+", help="SysEx files to parse")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Only report errors and the summary, not each file")
+    args = parser.parse_args()
 
-    out_csv = Path(sys.argv[1])
-    input_files = sys.argv[2:]
+    out_csv = args.out_csv
+    input_files = [Path(p) for p in args.files]
     
     print(f"Parsing {len(input_files)} SysEx files...")
     
     all_rows = []
-    for file_path in input_files:
-        path = Path(file_path)
-        if not path.exists():
-            print(f"[WARN] File not found: {path}")
-            continue
-            
-        try:
-            rows = parse_sysex_file(path)
+    exists = [path.exists() for path in input_files]
+    found = [path for path, ok in zip(input_files, exists) if ok]
+    serial = len(found) <= 1 or args.jobs == 1
+    # Files parse independently; results come back in input order
+    # (the pool only starts workers once something is submitted)
+    with ProcessPoolExecutor(max_workers=args.jobs or os.cpu_count()) as ex:
+        results = map(parse_sysex_file_logged, found) if serial else ex.map(parse_sysex_file_logged, found, chunksize=32)
+        for path, ok in zip(input_files, exists):
+            if not ok:
+                print(f"[WARN] File not found: {path}")
+                continue
+                
+            rows, log, error = next(results)
+            if not args.quiet:
+                sys.stdout.write(log)
+            if error is not None:
+                print(f"[ERROR] {path.name}: {error}")
+                continue
             all_rows.extend(rows)
-            print(f"[OK] {path.name}: {len(rows)} messages")
-        except Exception as e:
-            print(f"[ERROR] {path.name}: {e}")
+            if not args.quiet:
+                print(f"[OK] {path.name}: {len(rows)} messages")
 
     # Merge names with headers
     merged_rows = merge_names_with_headers(all_rows)
     
     # Sort by ROM ID, then preset number
-    merged_rows.sort(key=lambda x: (x["rom_id"], x["preset_num"]))
+    merged_rows.sort(key=itemgetter(2, 1))
 
     # Write CSV
-    fieldnames = ["filename", "preset_num", "rom_id", "preset_name", "layer_index", "filter_type_id", "message_type"]
     with out_csv.open("w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
+        w = csv.writer(f)
+        w.writerow(ROW_FIELDS)
         w.writerows(merged_rows)
 
     print(f"\n[SUCCESS] Wrote {len(merged_rows)} presets → {out_csv}")
@@ -193,7 +246,7 @@ def main():
     # Show summary
     rom_counts = defaultdict(int)
     for row in merged_rows:
-        rom_counts[row["rom_id"]] += 1
+        rom_counts[row[2]] += 1
     
     print("\nROM ID Summary:")
     for rom_id, count in sorted(rom_counts.items()):
@@ -48,7 +48,7 @@ def u16_stream_be(b: bytes):
     return list(struct.unpack('>' + 'H'*(len(b)//2), b))
 
 def extract_candidate_shapes(syx_path):
-    """Extract candidate Z-plane shapes from SysEx file."""
+    """Extract candidate Z-plane shapes from SysEx file (a path, or its contents)."""
     unpacked = split_and_unpack(syx_path)
     shapes = []
 
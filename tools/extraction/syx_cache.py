@@ -0,0 +1,78 @@
+# tools/extraction/syx_cache.py
+"""
+Cached SysEx splitting for the dump/scrape tools.
+
+load_messages(path) returns the same list as split_sysex_file(path), but the
+message boundaries are remembered per (size, mtime): in memory, and in a
+<file>.sxcache sidecar so the next run on an unchanged dump skips the F0/F7
+scan. The sidecar holds offsets only; messages are always sliced from the file.
+"""
+from __future__ import annotations
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+try:
+    from tools.extraction.syx_tools import iter_sysex_spans, map_file
+except ImportError:  # run from tools/extraction itself
+    from syx_tools import iter_sysex_spans, map_file
+
+CACHE_SUFFIX = '.sxcache'
+_HDR = struct.Struct('<4sQQQ')  # magic, file size, mtime_ns, message count
+_MAGIC = b'SXC2'
+
+def _read_sidecar(cpath: Path, size: int, mtime_ns: int):
+    try:
+        raw = cpath.read_bytes()
+    except OSError:
+        return None
+    if len(raw) < _HDR.size:
+        return None
+    magic, hsize, hmtime, count = _HDR.unpack_from(raw)
+    offs = array('Q')
+    # A short (truncated) sidecar fails the length check, not just a misaligned one
+    if (magic, hsize, hmtime) != (_MAGIC, size, mtime_ns) or len(raw) != _HDR.size + count * 2 * offs.itemsize:
+        return None
+    offs.frombytes(raw[_HDR.size:])
+    if sys.byteorder == 'big':
+        offs.byteswap()
+    return offs
+
+def _write_sidecar(cpath: Path, size: int, mtime_ns: int, offs: array):
+    if sys.byteorder == 'big':
+        offs = array('Q', offs)
+        offs.byteswap()
+    # Written beside the sidecar and renamed over it, so readers never see a partial file
+    tmp = cpath.with_name(f'{cpath.name}.{os.getpid()}.tmp')
+    try:
+        tmp.write_bytes(_HDR.pack(_MAGIC, size, mtime_ns, len(offs) // 2) + offs.tobytes())
+        os.replace(tmp, cpath)
+    except OSError:
+        # read-only location: the in-memory cache still applies
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+@lru_cache(maxsize=64)
+def _offsets(path: str, size: int, mtime_ns: int) -> array:
+    """Flat start, end, start, end, ... offsets of the messages (treat as read-only)"""
+    cpath = Path(path + CACHE_SUFFIX)
+    offs = _read_sidecar(cpath, size, mtime_ns)
+    if offs is None:
+        with map_file(path) as blob:
+            offs = array('Q', [x for span in iter_sysex_spans(blob) for x in span])
+        _write_sidecar(cpath, size, mtime_ns, offs)
+    return offs
+
+def load_messages(path: str | Path) -> List[bytes]:
+    """SysEx messages of path, as split_sysex_file would return them."""
+    path = os.fspath(path)
+    st = os.stat(path)
+    offs = iter(_offsets(os.path.abspath(path), st.st_size, st.st_mtime_ns))
+    with map_file(path) as blob:
+        return [blob[i:j] for i, j in zip(offs, offs)]
@@ -1,31 +1,63 @@
 # tools/extraction/syx_tools.py
 from __future__ import annotations
+import json
+import mmap
+import os
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterable, Tuple, List
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
 F0, F7 = 0xF0, 0xF7
+EMU_ID = 0x18  # E-mu Systems manufacturer ID
+
+def iter_sysex_spans(blob: bytes) -> Iterable[Tuple[int, int]]:
+    """(start, end) of each F0 ... F7 message in blob (bytes, bytearray or mmap); an unterminated tail is dropped."""
+    start, end = bytes((F0,)), bytes((F7,))  # mmap.find takes bytes, not ints
+    i = blob.find(start)
+    while i >= 0:
+        j = blob.find(end, i + 1)
+        if j < 0: break
+        yield i, j + 1
+        i = blob.find(start, j + 1)
 
 def iter_sysex_messages(blob: bytes) -> Iterable[bytes]:
-    i, n = 0, len(blob)
-    while i < n:
-        while i < n and blob[i] != F0:
-            i += 1
-        if i >= n: break
-        j = i + 1
-        while j < n and blob[j] != F7:
-            j += 1
-        if j >= n: break
-        yield blob[i:j+1]
-        i = j + 1
+    for i, j in iter_sysex_spans(blob):
+        yield blob[i:j]
+
+@contextmanager
+def map_file(path: str | Path):
+    """Read-only mapping of path (b'' for an empty file); slices of it are bytes."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def write_json(path: str | Path, obj) -> None:
+    """Write obj as 2-space indented JSON, via orjson when available."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
 
 def split_sysex_file(path: str | Path) -> List[bytes]:
-    return list(iter_sysex_messages(Path(path).read_bytes()))
+    # Messages are copied out of the mapping; the file itself is never read whole
+    with map_file(path) as blob:
+        return list(iter_sysex_messages(blob))
 
 def is_emu_proteus(msg: bytes) -> bool:
     # F0 18 0F dd 55 ...
     return (
         len(msg) >= 6 and
-        msg[0] == 0xF0 and msg[1] == 0x18 and msg[2] == 0x0F
+        msg[0] == 0xF0 and msg[1] == EMU_ID and msg[2] == 0x0F
     )
 
 def emu_fields(msg: bytes) -> Tuple[int,int,int,bytes]:
@@ -61,9 +93,15 @@ def unpack_7bit(payload: bytes) -> bytes:
             i += 1
     return bytes(out)
 
+def read_sysex(src) -> bytes:
+    """File contents: src itself if it already holds them (bytes, bytearray or mmap), else the file at path src."""
+    if isinstance(src, (bytes, bytearray, mmap.mmap)):
+        return src
+    return Path(src).read_bytes()
+
 def split_and_unpack(path: str):
-    """Split SysEx file into messages and unpack 7-bit encoding."""
-    raw = Path(path).read_bytes()
+    """Split SysEx file (a path, or its contents) into messages and unpack 7-bit encoding."""
+    raw = read_sysex(path)
     msgs = list(iter_sysex_messages(raw))
     out = []
     for m in msgs:
@@ -79,9 +117,9 @@ def split_and_unpack(path: str):
     return out
 
 def analyze_sysex_file(path: str) -> dict:
-    """Analyze a SysEx file and return basic info."""
+    """Analyze a SysEx file (a path, or its contents) and return basic info."""
     try:
-        raw = Path(path).read_bytes()
+        raw = read_sysex(path)
         msgs = list(iter_sysex_messages(raw))
 
         info = {
@@ -0,0 +1,37 @@
+# tools/extraction/table_scan.py
+"""
+Float32 table statistics shared by bin_inspector and chunked_table_scanner.
+
+Both scanners look for a table start inside a run of sane values and judge
+every candidate tail run[k:] at once, so the statistics here are whole-array
+passes (sliding windows and suffix sums) rather than per-start loops.
+"""
+import numpy as np
+
+def window_std_ok(run, min_len, thresh, batch=1 << 16):
+    """std(run[k:k+min_len]) > thresh for every window start k"""
+    windows = np.lib.stride_tricks.sliding_window_view(run, min_len)
+    ok = np.empty(len(windows), dtype=bool)
+    for b in range(0, len(windows), batch):
+        std = windows[b:b+batch].std(axis=-1)
+        ok[b:b+batch] = std > thresh
+        # Batched float32 std can differ in the last bits; settle near-threshold windows exactly
+        for k in np.flatnonzero((std > 0.5*thresh) & (std < 2*thresh)).tolist():
+            ok[b+k] = float(np.std(windows[b+k])) > thresh
+    return ok
+
+def tail_stats(run, n):
+    """(length, frac_pos, zc, ptp) of each tail run[k:] for k < n, from suffix sums.
+
+    frac_pos is the fraction of rising steps, zc half the sign flips and ptp the
+    peak-to-peak range, matching np.mean(np.diff(t) > 0), np.sum(np.abs(np.diff(
+    np.sign(t)))) / 2 and np.ptp(t) for t = run[k:].
+    """
+    length = run.size - np.arange(n)
+    rising = np.concatenate((np.cumsum((np.diff(run) > 0)[::-1])[::-1], [0]))[:n]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        frac_pos = rising / (length - 1)
+    flips = np.abs(np.diff(np.sign(run))).astype(np.float64)
+    zc = np.concatenate((np.cumsum(flips[::-1])[::-1], [0.0]))[:n] / 2
+    ptp = (np.maximum.accumulate(run[::-1])[::-1] - np.minimum.accumulate(run[::-1])[::-1])[:n]
+    return length, frac_pos, zc, ptp
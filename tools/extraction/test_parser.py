@@ -35,20 +35,20 @@ for file_path in all_files:
 merged_rows = merge_names_with_headers(all_rows)
 
 # Sort by ROM ID, then preset number
-merged_rows.sort(key=lambda x: (x["rom_id"], x["preset_num"]))
+merged_rows.sort(key=lambda x: (x[2], x[1]))  # rom_id, preset_num
 
-# Write CSV
+# Write CSV (the first four ROW_FIELDS columns)
 with open("test_all_presets.csv", "w", newline="") as f:
-    w = csv.DictWriter(f, fieldnames=["filename", "preset_num", "rom_id", "preset_name"])
-    w.writeheader()
-    w.writerows(merged_rows)
+    w = csv.writer(f)
+    w.writerow(["filename", "preset_num", "rom_id", "preset_name"])
+    w.writerows(row[:4] for row in merged_rows)
 
 print(f"\n[SUCCESS] Wrote {len(merged_rows)} presets → test_all_presets.csv")
 
 # Show summary
 rom_counts = defaultdict(int)
 for row in merged_rows:
-    rom_counts[row["rom_id"]] += 1
+    rom_counts[row[2]] += 1
 
 print("\nROM ID Summary:")
 for rom_id, count in sorted(rom_counts.items()):